@@ -0,0 +1,86 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def _user_cache():
+    return caches[getattr(settings, 'JWT_USER_CACHE_ALIAS', 'default')]
+
+
+def _user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def forget_cached_user(user_id):
+    _user_cache().delete(_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Stateless JWT authentication that keeps the token's user in a short-lived
+    cache instead of loading it from auth_user on every request.
+
+    The entry lives for JWT_USER_CACHE_TIMEOUT seconds and is dropped whenever
+    the user is saved or deleted in this process, so a deactivated user is
+    rejected at most that long after the change elsewhere.
+    """
+
+    def get_user(self, validated_token):
+        timeout = getattr(settings, 'JWT_USER_CACHE_TIMEOUT', 60)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not timeout or user_id is None:
+            return super().get_user(validated_token)
+
+        cache = _user_cache()
+        key = _user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Runs simplejwt's own lookup and checks
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout)
+            return user
+        return self.check_cached_user(user, validated_token)
+
+    def check_cached_user(self, user, validated_token):
+        # Apply the same checks to the cached copy
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views. Token validation is pure computation;
+        only the user lookup awaits the cache and, on a miss, the database.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        timeout = getattr(settings, 'JWT_USER_CACHE_TIMEOUT', 60)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not timeout or user_id is None:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        cache = _user_cache()
+        key = _user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            await cache.aset(key, user, timeout)
+            return user
+        return self.check_cached_user(user, validated_token)
@@ -8,8 +8,39 @@ from django.utils.translation import gettext as _
 from djoser.email import PasswordResetEmail, PasswordChangedConfirmationEmail
 from django.conf import settings
 
+from .mail import send_message
 
-class CustomPasswordResetEmail(PasswordResetEmail):
+
+class DispatchedEmailMixin:
+    """Builds the message from render() and delivers it through accounts.mail with retries"""
+
+    def send(self, to, *args, **kwargs):
+        self.to = to
+        self.cc = kwargs.pop("cc", [])
+        self.bcc = kwargs.pop("bcc", [])
+        self.reply_to = kwargs.pop("reply_to", [])
+        self.from_email = kwargs.pop("from_email", None)
+        
+        self.render()
+        send_message(self.build_message())
+
+    def build_message(self):
+        msg = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.text_body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            reply_to=self.reply_to,
+        )
+        
+        if self.html_body:
+            msg.attach_alternative(self.html_body, "text/html")
+        return msg
+
+
+class CustomPasswordResetEmail(DispatchedEmailMixin, PasswordResetEmail):
     template_name = "registration/password_reset_email.html"
     text_template_name = "registration/password_reset_email.txt"
 
@@ -37,30 +68,6 @@ class CustomPasswordResetEmail(PasswordResetEmail):
         
         return context
 
-    def send(self, to, *args, **kwargs):
-        self.to = to
-        self.cc = kwargs.pop("cc", [])
-        self.bcc = kwargs.pop("bcc", [])
-        self.reply_to = kwargs.pop("reply_to", [])
-        self.from_email = kwargs.pop("from_email", None)
-        
-        self.render()
-        
-        msg = EmailMultiAlternatives(
-            subject=self.subject,
-            body=self.text_body,
-            from_email=self.from_email,
-            to=self.to,
-            cc=self.cc,
-            bcc=self.bcc,
-            reply_to=self.reply_to,
-        )
-        
-        if self.html_body:
-            msg.attach_alternative(self.html_body, "text/html")
-        
-        msg.send()
-
     def render(self):
         context = self.get_context_data()
         self.subject = _("Password Reset - BudgetMaster")
@@ -68,7 +75,7 @@ class CustomPasswordResetEmail(PasswordResetEmail):
         self.text_body = render_to_string(self.text_template_name, context)
 
 
-class CustomPasswordChangedEmail(PasswordChangedConfirmationEmail):
+class CustomPasswordChangedEmail(DispatchedEmailMixin, PasswordChangedConfirmationEmail):
     template_name = "registration/password_changed_email.html"
     text_template_name = "registration/password_changed_email.txt"
 
@@ -90,30 +97,6 @@ class CustomPasswordChangedEmail(PasswordChangedConfirmationEmail):
         context["protocol"] = "https" if self.request.is_secure() else "http"
         return context
 
-    def send(self, to, *args, **kwargs):
-        self.to = to
-        self.cc = kwargs.pop("cc", [])
-        self.bcc = kwargs.pop("bcc", [])
-        self.reply_to = kwargs.pop("reply_to", [])
-        self.from_email = kwargs.pop("from_email", None)
-        
-        self.render()
-        
-        msg = EmailMultiAlternatives(
-            subject=self.subject,
-            body=self.text_body,
-            from_email=self.from_email,
-            to=self.to,
-            cc=self.cc,
-            bcc=self.bcc,
-            reply_to=self.reply_to,
-        )
-        
-        if self.html_body:
-            msg.attach_alternative(self.html_body, "text/html")
-        
-        msg.send()
-
     def render(self):
         context = self.get_context_data()
         self.subject = _("Password Changed - BudgetMaster")
@@ -0,0 +1,104 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class DispatchResult:
+    def __init__(self):
+        self.sent = []
+        self.failed = []  # (message, exception) pairs
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def send_messages(messages, max_workers=None, batch_size=None, retries=None, backoff=None):
+    """
+    Deliver EmailMessage objects in batches over reused connections.
+
+    Messages are split into batches of `batch_size`. Each batch is sent by one worker
+    thread (at most `max_workers` at a time) over a single backend connection that
+    stays open for the whole batch. A message that fails is retried up to `retries`
+    times with exponential backoff, reopening the connection in between. Failures
+    are collected in the result rather than raised.
+    """
+    messages = list(messages)
+    max_workers = max_workers or _setting('EMAIL_DISPATCH_WORKERS', 4)
+    batch_size = batch_size or _setting('EMAIL_DISPATCH_BATCH_SIZE', 50)
+    retries = _setting('EMAIL_DISPATCH_RETRIES', 3) if retries is None else retries
+    backoff = _setting('EMAIL_DISPATCH_BACKOFF', 0.5) if backoff is None else backoff
+
+    result = DispatchResult()
+    if not messages:
+        return result
+
+    batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    if len(batches) == 1:
+        outcomes = [_send_batch(batches[0], retries, backoff)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            outcomes = list(pool.map(lambda batch: _send_batch(batch, retries, backoff), batches))
+
+    for sent, failed in outcomes:
+        result.sent.extend(sent)
+        result.failed.extend(failed)
+    return result
+
+
+def send_message(message, retries=None, backoff=None):
+    """
+    Deliver a single message with retries; raises the last error if every attempt fails.
+    """
+    result = send_messages([message], retries=retries, backoff=backoff)
+    if result.failed:
+        raise result.failed[0][1]
+
+
+def _send_batch(batch, retries, backoff):
+    # SMTP connections are not thread-safe, so every batch gets its own
+    connection = get_connection(fail_silently=False)
+    sent, failed = [], []
+    try:
+        connection.open()
+        for message in batch:
+            error = _send_with_retry(connection, message, retries, backoff)
+            if error is None:
+                sent.append(message)
+            else:
+                failed.append((message, error))
+    except Exception as exc:
+        # Could not even open the connection: report the rest of the batch as failed
+        logger.exception('Email dispatch connection failed')
+        done = {id(message) for message in sent} | {id(message) for message, _ in failed}
+        failed.extend((message, exc) for message in batch if id(message) not in done)
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            logger.warning('Error closing email connection', exc_info=True)
+    return sent, failed
+
+
+def _send_with_retry(connection, message, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            connection.send_messages([message])
+            return None
+        except Exception as exc:
+            if attempt >= retries:
+                logger.error('Giving up on email to %s: %s', ', '.join(message.to), exc)
+                return exc
+            logger.warning('Email to %s failed (attempt %d): %s', ', '.join(message.to), attempt + 1, exc)
+            time.sleep(backoff * (2 ** attempt))
+            # The server may have dropped us; start over on a fresh connection
+            try:
+                connection.close()
+            except Exception:
+                pass
+            connection.open()
@@ -1,117 +1,96 @@
 from django.core.management.base import BaseCommand
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.db.models import Q
 from django.utils import timezone
-from accounts.models import NotificationSettings
+from accounts.mail import send_messages
+from accounts.models import NotificationSettings, MINUTES_PER_DAY
+from accounts.templating import PersonalizedTemplate, RecipientPlaceholder
 from django.conf import settings
-import datetime
-from datetime import timedelta
-import re
+
+# Send to users whose reminder falls within this many minutes of the current run.
+# This allows for cron jobs that run every 5-10 minutes
+WINDOW_MINUTES = 5
+
 
 class Command(BaseCommand):
     help = 'Send reminder emails to users'
 
-    def parse_timezone_offset(self, tz_string):
+    def minute_window(self, current_minute, window=WINDOW_MINUTES):
         """
-        Parse timezone string like 'GMT+5:30' or 'GMT-8:00' and return timedelta offset.
+        Q filter matching reminder_utc_minute within +/- window of current_minute,
+        wrapping around midnight UTC.
         """
-        if tz_string == 'UTC':
-            return timedelta(0)
-        
-        # Match GMT+/-HH:MM or GMT+/-H:MM
-        match = re.match(r'GMT([+-])(\d{1,2}):(\d{2})', tz_string)
-        if not match:
-            # Fallback to UTC if parsing fails
-            return timedelta(0)
-        
-        sign = match.group(1)
-        hours = int(match.group(2))
-        minutes = int(match.group(3))
-        
-        offset = timedelta(hours=hours, minutes=minutes)
-        if sign == '-':
-            offset = -offset
-        
-        return offset
+        low = current_minute - window
+        high = current_minute + window
+        if low < 0:
+            return Q(reminder_utc_minute__gte=low + MINUTES_PER_DAY) | Q(reminder_utc_minute__lte=high)
+        if high >= MINUTES_PER_DAY:
+            return Q(reminder_utc_minute__gte=low) | Q(reminder_utc_minute__lte=high - MINUTES_PER_DAY)
+        return Q(reminder_utc_minute__gte=low, reminder_utc_minute__lte=high)
 
-    def convert_local_to_utc(self, local_time, timezone_str):
+    def due_settings(self, now):
         """
-        Convert local time to UTC time.
-        local_time: datetime.time object
-        timezone_str: string like 'GMT+5:30'
-        Returns: datetime.time object in UTC
+        Notification settings due at `now`, selected in the database with reminder_due_idx.
         """
-        offset = self.parse_timezone_offset(timezone_str)
-        
-        # Create a datetime object for today with the local time
-        today = datetime.date.today()
-        local_datetime = datetime.datetime.combine(today, local_time)
-        
-        # Subtract the offset to get UTC time
-        utc_datetime = local_datetime - offset
-        
-        return utc_datetime.time()
+        frequencies = ['daily']
+        if now.weekday() == 0:  # 0 is Monday
+            frequencies.append('weekly')
+
+        current_minute = now.hour * 60 + now.minute
+        return (
+            NotificationSettings.objects
+            .filter(reminder_frequency__in=frequencies)
+            .filter(self.minute_window(current_minute))
+            .select_related('user')
+        )
 
     def handle(self, *args, **options):
         now = timezone.now()
-        current_utc_time = now.time()
-        current_hour = current_utc_time.hour
-        current_minute = current_utc_time.minute
-        
+
         self.stdout.write(f"Running reminders check at {now} UTC")
-        self.stdout.write(f"Current UTC time: {current_hour:02d}:{current_minute:02d}")
-        
-        notification_settings = NotificationSettings.objects.exclude(reminder_frequency='none')
-        
-        for setting in notification_settings:
-            if not setting.reminder_time:
-                continue
-            
-            # Convert user's local time to UTC
-            user_timezone = setting.timezone or 'UTC'
-            utc_reminder_time = self.convert_local_to_utc(setting.reminder_time, user_timezone)
-            
-            self.stdout.write(f"User {setting.user.email}: Local time {setting.reminder_time} ({user_timezone}) -> UTC {utc_reminder_time}")
-            
-            should_send = False
-            
-            # Check if the current hour and minute match (within a 5-minute window)
-            # This allows for cron jobs that run every 5-10 minutes
-            time_diff = abs((utc_reminder_time.hour * 60 + utc_reminder_time.minute) - 
-                           (current_hour * 60 + current_minute))
-            
-            if time_diff <= 5:  # Within 5 minutes
-                if setting.reminder_frequency == 'daily':
-                    should_send = True
-                elif setting.reminder_frequency == 'weekly':
-                    # 0 is Monday
-                    if now.weekday() == 0:
-                        should_send = True
-            
-            if should_send:
-                try:
-                    self.send_email(setting.user)
-                    self.stdout.write(self.style.SUCCESS(f'Sent reminder to {setting.user.email}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"Failed to send email to {setting.user.email}: {e}"))
+        self.stdout.write(f"Current UTC time: {now.hour:02d}:{now.minute:02d}")
 
-    def send_email(self, user):
-        subject = "Time to update your BudgetMaster!"
+        # Shared parts of the email are rendered once per run, not once per user
+        html_template, text_template = self.prerender_templates()
+
+        messages = []
+        for setting in self.due_settings(now):
+            user = setting.user
+            self.stdout.write(f"User {user.email}: Local time {setting.reminder_time} ({setting.timezone}) is due")
+            try:
+                messages.append(self.build_email(user, html_template, text_template))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Failed to build email for {user.email}: {e}"))
+
+        # Deliver the whole run over a few reused connections instead of one per user
+        result = send_messages(messages)
+        for msg in result.sent:
+            self.stdout.write(self.style.SUCCESS(f'Sent reminder to {msg.to[0]}'))
+        for msg, error in result.failed:
+            self.stdout.write(self.style.ERROR(f"Failed to send email to {msg.to[0]}: {error}"))
+
+    def prerender_templates(self):
         context = {
-            'user': user,
+            'user': RecipientPlaceholder(),
             'site_name': getattr(settings, 'SITE_NAME', 'BudgetMaster'),
             'domain': getattr(settings, 'DOMAIN', 'budget-master-app.vercel.app'),
             'protocol': 'https',
         }
-        
-        html_content = render_to_string('registration/reminder_email.html', context)
-        text_content = render_to_string('registration/reminder_email.txt', context)
-        
+        return (
+            PersonalizedTemplate('registration/reminder_email.html', context),
+            PersonalizedTemplate('registration/reminder_email.txt', context),
+        )
+
+    def build_email(self, user, html_template, text_template):
+        subject = "Time to update your BudgetMaster!"
+        # Same fallback as the templates' `user.first_name|default:user.username`
+        name = user.first_name or user.username
+
         msg = EmailMultiAlternatives(
             subject,
-            text_content,
+            text_template.render_for(name=name, email=user.email),
             settings.DEFAULT_FROM_EMAIL,
             [user.email]
         )
-        msg.attach_alternative(html_content, "text/html")
-        msg.send()
+        msg.attach_alternative(html_template.render_for(name=name, email=user.email), "text/html")
+        return msg
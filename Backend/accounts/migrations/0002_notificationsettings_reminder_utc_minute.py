@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+import re
+
+
+def backfill_reminder_utc_minute(apps, schema_editor):
+    NotificationSettings = apps.get_model('accounts', 'NotificationSettings')
+
+    def offset_minutes(tz_string):
+        match = re.match(r'GMT([+-])(\d{1,2}):(\d{2})', tz_string or '')
+        if not match:
+            return 0
+        minutes = int(match.group(2)) * 60 + int(match.group(3))
+        return -minutes if match.group(1) == '-' else minutes
+
+    batch = []
+    for setting in NotificationSettings.objects.filter(reminder_time__isnull=False).iterator():
+        local_minute = setting.reminder_time.hour * 60 + setting.reminder_time.minute
+        setting.reminder_utc_minute = (local_minute - offset_minutes(setting.timezone)) % (24 * 60)
+        batch.append(setting)
+        if len(batch) >= 1000:
+            NotificationSettings.objects.bulk_update(batch, ['reminder_utc_minute'])
+            batch = []
+    if batch:
+        NotificationSettings.objects.bulk_update(batch, ['reminder_utc_minute'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationsettings',
+            name='reminder_utc_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='notificationsettings',
+            index=models.Index(fields=['reminder_frequency', 'reminder_utc_minute'], name='reminder_due_idx'),
+        ),
+        migrations.RunPython(backfill_reminder_utc_minute, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_user_emails(apps, schema_editor):
+    # auth_user.email is not unique. When several accounts share an address
+    # (ignoring case), the oldest account (lowest id) keeps it for email login;
+    # the others get no lookup email and must sign in by username.
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UserEmail = apps.get_model('accounts', 'UserEmail')
+
+    seen = set()
+    batch = []
+    for user_id, email in User.objects.order_by('id').values_list('id', 'email').iterator():
+        normalized = (email or '').strip().lower() or None
+        if normalized in seen:
+            normalized = None
+        elif normalized is not None:
+            seen.add(normalized)
+        batch.append(UserEmail(user_id=user_id, email=normalized))
+        if len(batch) >= 1000:
+            UserEmail.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UserEmail.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_notificationsettings_reminder_utc_minute'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEmail',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='email_lookup', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('email', models.CharField(max_length=254, null=True, unique=True)),
+            ],
+        ),
+        migrations.RunPython(populate_user_emails, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,44 @@
-from django.db import models
+import re
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from .authentication import forget_cached_user
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_timezone_offset(tz_string):
+    """
+    Parse timezone string like 'GMT+5:30' or 'GMT-8:00' and return timedelta offset.
+    """
+    if not tz_string or tz_string == 'UTC':
+        return timedelta(0)
+
+    # Match GMT+/-HH:MM or GMT+/-H:MM
+    match = re.match(r'GMT([+-])(\d{1,2}):(\d{2})', tz_string)
+    if not match:
+        # Fallback to UTC if parsing fails
+        return timedelta(0)
+
+    offset = timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+    if match.group(1) == '-':
+        offset = -offset
+    return offset
+
+
+def utc_minute_of_day(local_time, tz_string):
+    """
+    Convert a local reminder time to minutes after midnight UTC (0-1439).
+    """
+    local_minute = local_time.hour * 60 + local_time.minute
+    offset_minutes = int(parse_timezone_offset(tz_string).total_seconds() // 60)
+    return (local_minute - offset_minutes) % MINUTES_PER_DAY
+
+
 class NotificationSettings(models.Model):
     FREQUENCY_CHOICES = [
         ('none', 'None'),
@@ -14,15 +50,88 @@ class NotificationSettings(models.Model):
     reminder_frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='none')
     reminder_time = models.TimeField(null=True, blank=True)
     timezone = models.CharField(max_length=20, default='UTC', help_text='Timezone in GMT format (e.g., GMT+5:30)')
-    
+    # reminder_time converted to UTC minutes after midnight, kept in sync by save()
+    reminder_utc_minute = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['reminder_frequency', 'reminder_utc_minute'], name='reminder_due_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.reminder_time is None:
+            self.reminder_utc_minute = None
+        else:
+            self.reminder_utc_minute = utc_minute_of_day(self.reminder_time, self.timezone or 'UTC')
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'reminder_utc_minute' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['reminder_utc_minute']
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.user.username} - {self.reminder_frequency}"
 
+def normalize_email(email):
+    """
+    Case-insensitive form of an address used for login lookups, or None if blank.
+    """
+    email = (email or '').strip().lower()
+    return email or None
+
+
+# Indexed, case-normalized copy of auth_user.email, which has neither an index
+# nor a uniqueness guarantee. Kept in sync by the post_save signal below
+class UserEmail(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='email_lookup')
+    email = models.CharField(max_length=254, unique=True, null=True)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.email}"
+
+
+def get_user_by_email(email, **filters):
+    """
+    Resolve a login email through the unique index; raises User.DoesNotExist.
+    """
+    normalized = normalize_email(email)
+    if normalized is None:
+        raise User.DoesNotExist
+    return User.objects.get(email_lookup__email=normalized, **filters)
+
+
+def email_in_use(email, exclude_user_id=None):
+    normalized = normalize_email(email)
+    if normalized is None:
+        return False
+    qs = UserEmail.objects.filter(email=normalized)
+    if exclude_user_id is not None:
+        qs = qs.exclude(user_id=exclude_user_id)
+    return qs.exists()
+
+
+@receiver(post_save, sender=User)
+def sync_user_email(sender, instance, created, update_fields=None, **kwargs):
+    # Saves that don't touch the email (e.g. last_login on every login) need no write
+    if not created and update_fields is not None and 'email' not in update_fields:
+        return
+    normalized = normalize_email(instance.email)
+    try:
+        with transaction.atomic():
+            UserEmail.objects.update_or_create(user=instance, defaults={'email': normalized})
+    except IntegrityError:
+        # Another account already owns this address; it stays the one email login resolves to
+        UserEmail.objects.update_or_create(user=instance, defaults={'email': None})
+
+
 @receiver(post_save, sender=User)
 def create_user_notification_settings(sender, instance, created, **kwargs):
+    # Only new users need a row; re-saving it on every User save (e.g. last_login) was a wasted write
     if created:
         NotificationSettings.objects.create(user=instance)
 
+
 @receiver(post_save, sender=User)
-def save_user_notification_settings(sender, instance, **kwargs):
-    instance.notification_settings.save()
+@receiver(post_delete, sender=User)
+def forget_authenticated_user(sender, instance, **kwargs):
+    # Drop the copy CachedJWTAuthentication keeps so changes apply on the next request
+    forget_cached_user(instance.pk)
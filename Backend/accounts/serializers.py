@@ -3,6 +3,9 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from djoser.serializers import UserSerializer
 from djoser.serializers import UserCreateSerializer as DjoserUserCreateSerializer
+from djoser.serializers import SendEmailResetSerializer
+from djoser.conf import settings as djoser_settings
+from .models import email_in_use, get_user_by_email
 
 # Reference to the custom or default User model
 User = get_user_model()
@@ -21,6 +24,11 @@ class UserCreateSerializer(DjoserUserCreateSerializer):
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'password', 're_password')
 
+    def validate_email(self, value):
+        if email_in_use(value):
+            raise serializers.ValidationError("A user with this email already exists.")
+        return value
+
     def validate(self, attrs):
         if 're_password' in attrs:
             re_password = attrs.pop('re_password')
@@ -53,6 +61,27 @@ class CustomUserSerializer(UserSerializer):
         fields = ('id', 'username', 'email', 'first_name')
         read_only_fields = ('username',)  # Username cannot be changed
 
+    def validate_email(self, value):
+        if email_in_use(value, exclude_user_id=self.instance.pk if self.instance else None):
+            raise serializers.ValidationError("A user with this email already exists.")
+        return value
+
+
+# Password/username reset request that finds the account through the UserEmail index
+class EmailLookupResetSerializer(SendEmailResetSerializer):
+    def get_user(self, is_active=True):
+        try:
+            user = get_user_by_email(self.data.get(self.email_field, ''), is_active=is_active)
+            if user.has_usable_password():
+                return user
+        except User.DoesNotExist:
+            pass
+        if (
+            djoser_settings.PASSWORD_RESET_SHOW_EMAIL_NOT_FOUND
+            or djoser_settings.USERNAME_RESET_SHOW_EMAIL_NOT_FOUND
+        ):
+            self.fail("email_not_found")
+
 
 from .models import NotificationSettings
 
@@ -0,0 +1,38 @@
+from django.template.loader import get_template
+from django.utils.html import escape
+
+
+def placeholder(name):
+    # Plain word characters, so autoescaping leaves the token untouched
+    return f'__BUDGETMASTER_{name.upper()}__'
+
+
+class RecipientPlaceholder:
+    """
+    Stand-in for a User in a template context. The name attributes render as the
+    'name' placeholder, so `user.first_name|default:user.username` yields the token.
+    """
+    first_name = placeholder('name')
+    username = placeholder('name')
+    email = placeholder('email')
+
+    def __str__(self):
+        return placeholder('name')
+
+
+class PersonalizedTemplate:
+    """
+    Render a template once with placeholder tokens for the per-recipient values,
+    then produce each recipient's copy with string substitution instead of
+    running the template engine again.
+    """
+
+    def __init__(self, template_name, context):
+        self.body = get_template(template_name).render(context)
+
+    def render_for(self, **values):
+        body = self.body
+        for name, value in values.items():
+            # The engine autoescapes variables, so the substituted values must be escaped too
+            body = body.replace(placeholder(name), escape(value))
+        return body
@@ -18,10 +18,10 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         username = attrs.get(self.username_field)
 
         if email and not username:
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
+            from .models import User, get_user_by_email
             try:
-                user = User.objects.get(email=email)
+                # Case-insensitive match through the unique index on UserEmail
+                user = get_user_by_email(email)
                 attrs[self.username_field] = user.get_username()
             except User.DoesNotExist:
                 # Let the super class handle the failure (it will fail on missing username or auth)
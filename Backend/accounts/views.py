@@ -31,4 +31,6 @@ class CronReminderView(APIView):
 
     def get(self, request):
         call_command('send_reminders')
+        # Same schedule creates the day's recurring transactions
+        call_command('materialize_recurring')
         return Response({'status': 'success', 'message': 'Reminders sent'})
@@ -0,0 +1,281 @@
+import calendar
+import datetime
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from .models import Budget, Debt, Transaction
+
+
+ZERO = Decimal('0.00')
+
+
+def parse_date_range(params):
+    """
+    Read optional 'start_date' / 'end_date' (YYYY-MM-DD) query params.
+    Returns a (start_date, end_date) tuple of date objects or None.
+    """
+    parsed = []
+    for key in ('start_date', 'end_date'):
+        value = params.get(key)
+        if not value:
+            parsed.append(None)
+            continue
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({key: 'Date has wrong format. Use YYYY-MM-DD.'})
+        parsed.append(day)
+
+    start_date, end_date = parsed
+    if start_date and end_date and start_date > end_date:
+        raise ValidationError({'end_date': 'End date must not be before start date.'})
+    return start_date, end_date
+
+
+def filter_date_range(qs, start_date=None, end_date=None):
+    if start_date:
+        qs = qs.filter(date__gte=start_date)
+    if end_date:
+        qs = qs.filter(date__lte=end_date)
+    return qs
+
+
+def summary_day(end_date, today):
+    # Budgets in a summary are measured over their window containing this day
+    return min(end_date, today) if end_date else today
+
+
+def summary_querysets(user, start_date=None, end_date=None):
+    # Grouped transaction sums for the date range, and the user's budgets
+    qs = filter_date_range(Transaction.objects.filter(user=user), start_date, end_date)
+    grouped = (
+        qs.order_by()
+        .values('transaction_type', 'category_id', 'category__name')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by('transaction_type', '-total')
+    )
+    budgets = Budget.objects.filter(user=user).select_related('category').order_by('-created_at')
+    return grouped, budgets
+
+
+def build_summary(user, start_date=None, end_date=None, today=None):
+    """
+    Totals and per-category breakdown for a user's transactions in the given
+    date range, from a single grouped query. Budget-vs-actual uses each
+    budget's own period window, the same as BudgetSerializer.
+    """
+    day = summary_day(end_date, today or datetime.date.today())
+    grouped, budgets = summary_querysets(user, start_date, end_date)
+    budgets = list(budgets)
+    progress = budget_progress(user, budgets, day)
+    return format_summary(start_date, end_date, list(grouped), budgets, progress)
+
+
+async def abuild_summary(user, start_date=None, end_date=None, today=None):
+    # Same as build_summary, fetching through the async ORM
+    day = summary_day(end_date, today or datetime.date.today())
+    grouped, budgets = summary_querysets(user, start_date, end_date)
+    budgets = [budget async for budget in budgets]
+    progress = await abudget_progress(user, budgets, day)
+    return format_summary(start_date, end_date, [row async for row in grouped], budgets, progress)
+
+
+def format_summary(start_date, end_date, grouped, budget_rows, progress):
+    totals = {'income': ZERO, 'expense': ZERO, 'savings': ZERO}
+    categories = []
+    for row in grouped:
+        total = row['total'] or ZERO
+        totals[row['transaction_type']] = totals.get(row['transaction_type'], ZERO) + total
+        categories.append({
+            'category_id': row['category_id'],
+            'category_name': row['category__name'],
+            'transaction_type': row['transaction_type'],
+            'total': _money(total),
+            'count': row['count'],
+        })
+
+    budgets = []
+    for budget in budget_rows:
+        window = progress[budget.id]
+        budgets.append({
+            'budget_id': budget.id,
+            'category_id': budget.category_id,
+            'category_name': budget.category.name,
+            'period': budget.period,
+            'period_start': window['period_start'],
+            'period_end': window['period_end'],
+            'amount': _money(budget.amount),
+            'spent': _money(window['spent']),
+            'remaining': _money(window['remaining']),
+            'percent': _money(window['percent']),
+        })
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'totals': {
+            'income': _money(totals['income']),
+            'expense': _money(totals['expense']),
+            'savings': _money(totals['savings']),
+            'balance': _money(totals['income'] - totals['expense'] - totals['savings']),
+        },
+        'categories': categories,
+        'budgets': budgets,
+    }
+
+
+def debt_is_overdue(debt, today):
+    return debt.paid_amount < debt.total_amount and debt.due_date is not None and debt.due_date < today
+
+
+def build_debt_summary(user, today):
+    """
+    Per-type totals, outstanding balances and overdue counts for a user's debts,
+    computed with conditional aggregation in one query grouped by debt_type.
+    """
+    remaining = ExpressionWrapper(
+        F('total_amount') - F('paid_amount'), output_field=DecimalField(max_digits=12, decimal_places=2)
+    )
+    open_debt = Q(paid_amount__lt=F('total_amount'))
+    overdue = open_debt & Q(due_date__lt=today)
+    grouped = (
+        Debt.objects.filter(user=user)
+        .order_by()
+        .values('debt_type')
+        .annotate(
+            count=Count('id'),
+            total=Sum('total_amount'),
+            paid=Sum('paid_amount'),
+            outstanding=Sum(remaining, filter=open_debt),
+            open_count=Count('id', filter=open_debt),
+            overdue_amount=Sum(remaining, filter=overdue),
+            overdue_count=Count('id', filter=overdue),
+        )
+    )
+
+    by_type = {}
+    for debt_type, _ in Debt.DEBT_TYPES:
+        by_type[debt_type] = {
+            'count': 0, 'total': _money(ZERO), 'paid': _money(ZERO), 'outstanding': _money(ZERO),
+            'open_count': 0, 'overdue_amount': _money(ZERO), 'overdue_count': 0,
+        }
+    for row in grouped:
+        by_type[row['debt_type']] = {
+            'count': row['count'],
+            'total': _money(row['total'] or ZERO),
+            'paid': _money(row['paid'] or ZERO),
+            'outstanding': _money(row['outstanding'] or ZERO),
+            'open_count': row['open_count'],
+            'overdue_amount': _money(row['overdue_amount'] or ZERO),
+            'overdue_count': row['overdue_count'],
+        }
+
+    return {
+        'as_of': today,
+        'types': by_type,
+        'overdue_count': sum(row['overdue_count'] for row in by_type.values()),
+    }
+
+
+def add_months(day, months):
+    # Same day-of-month `months` later, clamped to the end of shorter months
+    month_index = day.month - 1 + months
+    year = day.year + month_index // 12
+    month = month_index % 12 + 1
+    return datetime.date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def current_period(start_date, period, today):
+    """
+    The [period_start, period_end) window of a budget that contains `today`.
+    Windows are counted from start_date, so month-end anchors don't drift.
+    Budgets that haven't started yet report their first window.
+    """
+    if period == 'weekly':
+        elapsed = max((today - start_date).days // 7, 0)
+        period_start = start_date + datetime.timedelta(weeks=elapsed)
+        return period_start, period_start + datetime.timedelta(weeks=1)
+
+    step = 12 if period == 'yearly' else 1
+    months = max((today.year - start_date.year) * 12 + today.month - start_date.month, 0)
+    count = months // step
+    period_start = add_months(start_date, count * step)
+    if period_start > today and count > 0:
+        count -= 1
+        period_start = add_months(start_date, count * step)
+    return period_start, add_months(start_date, (count + 1) * step)
+
+
+def budget_spend_query(user, budgets, today):
+    # Current window per budget, and the conditional sums that total each one's spend
+    windows = {
+        budget.id: current_period(budget.start_date, budget.period, today)
+        for budget in budgets
+    }
+    sums = {
+        f'budget_{budget.id}': Sum('amount', filter=Q(
+            category_id=budget.category_id,
+            date__gte=windows[budget.id][0],
+            date__lt=windows[budget.id][1],
+        ))
+        for budget in budgets
+    }
+    qs = Transaction.objects.filter(
+        user=user,
+        transaction_type='expense',
+        category_id__in={budget.category_id for budget in budgets},
+        date__gte=min(start for start, _ in windows.values()),
+        date__lt=max(end for _, end in windows.values()),
+    )
+    return windows, qs, sums
+
+
+def budget_progress(user, budgets, today=None):
+    """
+    Spend in the current window of every budget, as {budget_id: progress dict}.
+    All budgets are resolved with a single conditional-aggregation query.
+    """
+    if not budgets:
+        return {}
+    windows, qs, sums = budget_spend_query(user, budgets, today or datetime.date.today())
+    return format_progress(budgets, windows, qs.aggregate(**sums))
+
+
+async def abudget_progress(user, budgets, today=None):
+    # Same as budget_progress, aggregating through the async ORM
+    if not budgets:
+        return {}
+    windows, qs, sums = budget_spend_query(user, budgets, today or datetime.date.today())
+    return format_progress(budgets, windows, await qs.aaggregate(**sums))
+
+
+def format_progress(budgets, windows, spent):
+    progress = {}
+    for budget in budgets:
+        amount_spent = spent[f'budget_{budget.id}'] or ZERO
+        remaining = budget.amount - amount_spent
+        period_start, period_end = windows[budget.id]
+        progress[budget.id] = {
+            'period_start': period_start,
+            'period_end': period_end,
+            'spent': amount_spent,
+            'remaining': remaining if remaining > 0 else ZERO,
+            'percent': _percent(amount_spent, budget.amount),
+        }
+    return progress
+
+
+def _money(value):
+    # Match the string formatting DRF uses for DecimalField output
+    return str(value.quantize(Decimal('0.01')))
+
+
+def _percent(part, whole):
+    if not whole:
+        return ZERO
+    return ((part / whole) * Decimal('100')).quantize(Decimal('0.01'))
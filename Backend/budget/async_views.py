@@ -0,0 +1,139 @@
+import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from accounts.authentication import CachedJWTAuthentication
+
+from .aggregates import abuild_summary, parse_date_range
+from .cache import aget_or_build
+from .conditional import async_conditional_on_user_data
+from .filters import filter_transactions
+from .models import Category, Transaction
+from .pagination import TransactionCursorPagination
+from .serializers import CategorySerializer, TransactionListSerializer, transaction_values
+from .streaming import astream_json_array
+
+
+# Async versions of the read-heavy endpoints, served in place of the DRF views
+# when the app runs under ASGI (asgi.py turns on ASYNC_READ_VIEWS). While one
+# request waits on the database the event loop serves the others, so a
+# dashboard's parallel fetches no longer hold one worker each.
+#
+# Responses are the same JSON, headers and status codes as the DRF views.
+# Writes are passed on to the DRF view for the same URL.
+
+authenticator = CachedJWTAuthentication()
+renderer = JSONRenderer()
+
+
+def render(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(renderer.render(data), status=status_code, content_type=renderer.media_type)
+
+
+def render_exception(exc, request):
+    # Same body and headers as rest_framework.views.exception_handler
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = render(data, exc.status_code)
+    if isinstance(exc, (exceptions.AuthenticationFailed, exceptions.NotAuthenticated)):
+        response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+    return response
+
+
+def handled_by_sync_view(request):
+    return request.method not in ('GET', 'HEAD')
+
+
+def async_read_view(sync_view):
+    """
+    Turn an async handler into a view for a URL that `sync_view` also serves.
+
+    The handler gets a DRF Request (for query_params) already authenticated
+    with the JWT, and its APIExceptions become the usual DRF error responses.
+    """
+    def decorator(handler):
+        @csrf_exempt
+        @wraps(handler)
+        async def view(request, *args, **kwargs):
+            if handled_by_sync_view(request):
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            drf_request = Request(request)
+            try:
+                user_auth = await authenticator.aauthenticate(request)
+                if user_auth is None:
+                    raise exceptions.NotAuthenticated()
+                drf_request.user, drf_request.auth = user_auth
+                return await handler(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return render_exception(exc, request)
+
+        return view
+    return decorator
+
+
+async def category_list(request, transaction_type=None):
+    qs = Category.objects.filter(user=request.user)
+    name = 'categories'
+    if transaction_type:
+        qs = qs.filter(transaction_type=transaction_type)
+        name = f'categories:{transaction_type}'
+
+    async def build():
+        return list(CategorySerializer([category async for category in qs], many=True).data)
+
+    return render(await aget_or_build(request.user.id, name, build))
+
+
+async def transaction_list(request, transaction_type=None):
+    qs = Transaction.objects.filter(user=request.user)
+    if transaction_type:
+        qs = qs.filter(transaction_type=transaction_type)
+    rows = transaction_values(filter_transactions(qs, request.query_params))
+
+    paginator = TransactionCursorPagination()
+    page_rows = paginator.page_queryset(rows, request)
+    if page_rows is not None:
+        page = paginator.set_page([row async for row in page_rows])
+        return render({
+            'next': paginator.get_next_link(),
+            'results': TransactionListSerializer(page, many=True).data,
+        })
+
+    return astream_json_array(rows.order_by('-date', '-id'), TransactionListSerializer)
+
+
+def summary_view(sync_view):
+    @async_read_view(sync_view)
+    @async_conditional_on_user_data
+    async def summary(request):
+        start_date, end_date = parse_date_range(request.query_params)
+        today = datetime.date.today()
+        data = await aget_or_build(
+            request.user.id,
+            f'summary:{start_date}:{end_date}:{today}',
+            lambda: abuild_summary(request.user, start_date, end_date, today),
+        )
+        return render(data)
+    return summary
+
+
+def category_list_view(sync_view, transaction_type=None):
+    @async_read_view(sync_view)
+    @async_conditional_on_user_data
+    async def categories(request):
+        return await category_list(request, transaction_type)
+    return categories
+
+
+def transaction_list_view(sync_view, transaction_type=None):
+    @async_read_view(sync_view)
+    @async_conditional_on_user_data
+    async def transactions(request):
+        return await transaction_list(request, transaction_type)
+    return transactions
@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import UserDataWatermark
+
+
+# Per-user versioned cache entries.
+#
+# Every cached value for a user is stored under a key that embeds the user's
+# current data version. The version is the user's UserDataWatermark row, which
+# every write bumps in its own transaction; the shared cache keeps a copy so
+# readers normally never hit the database for it. Writes replace the version
+# instead of deleting data keys, so invalidation works in every worker that
+# shares the cache backend and old entries simply age out.
+
+DEFAULT_TIMEOUT = 600  # 10 minutes
+
+# The cached watermark expires so that a copy a reader loaded just before a
+# write committed can only be stale for a bounded time
+WATERMARK_TIMEOUT = 300
+
+
+def _version_key(user_id):
+    return f'budget:user:{user_id}:watermark'
+
+
+def _load_watermark(user_id):
+    watermark, _ = UserDataWatermark.objects.get_or_create(
+        user_id=user_id, defaults={'modified_at': timezone.now()}
+    )
+    return watermark.version, watermark.modified_at
+
+
+def get_user_watermark(user_id):
+    """
+    Return the (version, modified_at) pair describing the user's data.
+    """
+    watermark = cache.get(_version_key(user_id))
+    if watermark is None:
+        watermark = _load_watermark(user_id)
+        # add() rather than set(): keep the copy another reader may have stored meanwhile
+        if not cache.add(_version_key(user_id), watermark, WATERMARK_TIMEOUT):
+            watermark = cache.get(_version_key(user_id), watermark)
+    return watermark
+
+
+async def aget_user_watermark(user_id):
+    # get_user_watermark() for async views
+    watermark = await cache.aget(_version_key(user_id))
+    if watermark is None:
+        row, _ = await UserDataWatermark.objects.aget_or_create(
+            user_id=user_id, defaults={'modified_at': timezone.now()}
+        )
+        watermark = row.version, row.modified_at
+        if not await cache.aadd(_version_key(user_id), watermark, WATERMARK_TIMEOUT):
+            watermark = await cache.aget(_version_key(user_id), watermark)
+    return watermark
+
+
+def get_user_version(user_id):
+    return get_user_watermark(user_id)[0]
+
+
+def mark_user_data_changed(user_id):
+    """
+    Advance the user's watermark. Call it inside the transaction that writes
+    the user's data, so the bump commits (or rolls back) with the write. The
+    cached copy is dropped once the transaction commits, and the next reader
+    loads the new watermark from the database.
+    """
+    now = timezone.now()
+    updated = UserDataWatermark.objects.filter(user_id=user_id).update(version=F('version') + 1, modified_at=now)
+    if not updated:
+        UserDataWatermark.objects.get_or_create(user_id=user_id, defaults={'modified_at': now})
+    transaction.on_commit(lambda: cache.delete(_version_key(user_id)))
+
+
+def mark_users_data_changed(user_ids=None):
+    """
+    mark_user_data_changed() for many users at once, or every user when
+    `user_ids` is None. Users without a watermark have nothing cached yet.
+    """
+    watermarks = UserDataWatermark.objects.all()
+    if user_ids is not None:
+        watermarks = watermarks.filter(user_id__in=user_ids)
+    changed = list(watermarks.values_list('user_id', flat=True))
+    watermarks.update(version=F('version') + 1, modified_at=timezone.now())
+    transaction.on_commit(lambda: cache.delete_many([_version_key(user_id) for user_id in changed]))
+
+
+def _data_key(user_id, version, name):
+    return f'budget:user:{user_id}:v{version}:{name}'
+
+
+def user_cache_key(user_id, name):
+    return _data_key(user_id, get_user_version(user_id), name)
+
+
+def get_or_build(user_id, name, builder, timeout=DEFAULT_TIMEOUT):
+    """
+    Return the cached value for (user, name) at the user's current version,
+    calling `builder()` and storing its result on a miss.
+    """
+    key = user_cache_key(user_id, name)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout)
+    return value
+
+
+async def aget_or_build(user_id, name, builder, timeout=DEFAULT_TIMEOUT):
+    # get_or_build() for async views; `builder` is a coroutine function
+    version, _ = await aget_user_watermark(user_id)
+    key = _data_key(user_id, version, name)
+    value = await cache.aget(key)
+    if value is None:
+        value = await builder()
+        await cache.aset(key, value, timeout)
+    return value
@@ -0,0 +1,81 @@
+import datetime
+import hashlib
+from functools import wraps
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import aget_user_watermark, get_user_watermark
+
+
+def user_data_etag(request, version):
+    # Same data version can still render differently per URL, query string,
+    # negotiated format and (for budget windows) day
+    parts = [
+        str(request.user.id),
+        str(version),
+        request.get_full_path(),
+        request.headers.get('Accept', ''),
+        datetime.date.today().isoformat(),
+    ]
+    return 'W/"%s"' % hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def user_data_last_modified(modified_at):
+    # Responses that depend on the current date change at midnight even without writes
+    midnight = timezone.make_aware(datetime.datetime.combine(datetime.date.today(), datetime.time.min))
+    return max(modified_at, midnight)
+
+
+def _validators(request, watermark):
+    version, modified_at = watermark
+    return user_data_etag(request, version), user_data_last_modified(modified_at).timestamp()
+
+
+def _add_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ('Accept', 'Authorization'))
+    # Per-user data: browsers may keep it but must revalidate, shared caches must not store it
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_on_user_data(view_method):
+    """
+    Decorator for read views over the requesting user's budget data.
+
+    Sets ETag / Last-Modified from the user's data watermark and answers a
+    matching If-None-Match / If-Modified-Since with 304 before the view runs,
+    so a revalidation never reaches the main tables or the serializers.
+    """
+    @wraps(view_method)
+    def wrapped(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+
+        etag, last_modified = _validators(request, get_user_watermark(request.user.id))
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return _add_validators(response, etag, last_modified)
+
+    return wrapped
+
+
+def async_conditional_on_user_data(view):
+    # conditional_on_user_data for async function views
+    @wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        etag, last_modified = _validators(request, await aget_user_watermark(request.user.id))
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return _add_validators(response, etag, last_modified)
+
+    return wrapped
@@ -0,0 +1,80 @@
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+
+from .aggregates import filter_date_range, parse_date_range
+from .models import Transaction
+
+TRANSACTION_TYPES = {value for value, _ in Transaction.TRANSACTION_TYPES}
+
+# Every query param filter_transactions reads; anything else is ignored there
+FILTER_PARAMS = {'types', 'type', 'start_date', 'end_date', 'categories', 'category', 'min_amount', 'max_amount'}
+
+
+def parse_list(params, *keys):
+    """
+    Collect comma-separated values from the first of `keys` present in the
+    query params, e.g. ?types=expense,income or repeated ?type=expense&type=income.
+    """
+    for key in keys:
+        values = [part.strip() for value in params.getlist(key) for part in value.split(',')]
+        values = [value for value in values if value]
+        if values:
+            return key, values
+    return keys[0], []
+
+
+def parse_amount(params, key):
+    value = params.get(key)
+    if not value:
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({key: 'A valid number is required.'})
+    if not amount.is_finite():
+        raise ValidationError({key: 'A valid number is required.'})
+    return amount
+
+
+def filter_transactions(qs, params):
+    """
+    Narrow a transaction queryset with the shared list filters:
+
+    - types / type: one or more transaction types, comma-separated
+    - start_date / end_date: inclusive date range (YYYY-MM-DD)
+    - categories / category: one or more category ids, comma-separated
+    - min_amount / max_amount: inclusive amount bounds
+
+    Type and date conditions sit next to the user filter so the
+    (user, transaction_type) and (user, date) indexes can drive the scan.
+    """
+    key, types = parse_list(params, 'types', 'type')
+    unknown = sorted(set(types) - TRANSACTION_TYPES)
+    if unknown:
+        raise ValidationError({key: f'Unknown transaction type: {", ".join(unknown)}.'})
+    if len(types) == 1:
+        qs = qs.filter(transaction_type=types[0])
+    elif types and len(set(types)) < len(TRANSACTION_TYPES):
+        qs = qs.filter(transaction_type__in=types)
+
+    start_date, end_date = parse_date_range(params)
+    qs = filter_date_range(qs, start_date, end_date)
+
+    key, categories = parse_list(params, 'categories', 'category')
+    if categories:
+        try:
+            category_ids = [int(value) for value in categories]
+        except ValueError:
+            raise ValidationError({key: 'Category ids must be integers.'})
+        qs = qs.filter(category_id__in=category_ids)
+
+    min_amount = parse_amount(params, 'min_amount')
+    max_amount = parse_amount(params, 'max_amount')
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise ValidationError({'max_amount': 'Maximum amount must not be below minimum amount.'})
+    if min_amount is not None:
+        qs = qs.filter(amount__gte=min_amount)
+    if max_amount is not None:
+        qs = qs.filter(amount__lte=max_amount)
+    return qs
@@ -0,0 +1,240 @@
+import codecs
+import csv
+import datetime
+import re
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .cache import mark_user_data_changed
+from .models import Category, Transaction
+from . import rollups
+
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y%m%d', '%d.%m.%Y')
+TRANSACTION_TYPES = {choice for choice, _ in Transaction.TRANSACTION_TYPES}
+MAX_AMOUNT = Decimal('9999999999.99')  # max_digits=12, decimal_places=2
+MAX_REPORTED_ERRORS = 200
+
+# Accepted spellings for CSV header columns
+CSV_COLUMNS = {
+    'date': ('date', 'transaction_date', 'posted', 'posted_date'),
+    'description': ('description', 'memo', 'name', 'payee', 'details'),
+    'amount': ('amount', 'value', 'sum'),
+    'category': ('category', 'category_name'),
+    'transaction_type': ('transaction_type', 'type', 'kind'),
+}
+
+
+def iter_csv_rows(uploaded_file):
+    """
+    Yield (line number, dict with the CSV_COLUMNS keys) for each CSV record; the
+    line number is where the record starts in the file, counting the header as
+    line 1. The upload is read incrementally, so large exports never have to fit
+    in memory.
+    """
+    text = codecs.iterdecode(uploaded_file, 'utf-8-sig')
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    positions = {}
+    normalized = [column.strip().lower() for column in header]
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                positions[field] = normalized.index(alias)
+                break
+
+    while True:
+        # Quoted fields can span lines, so the start line is where the previous record ended + 1
+        line_number = reader.line_num + 1
+        record = next(reader, None)
+        if record is None:
+            return
+        if not any(value.strip() for value in record):
+            continue
+        yield line_number, {
+            field: record[index].strip() if index < len(record) else ''
+            for field, index in positions.items()
+        }
+
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+
+def iter_ofx_rows(uploaded_file):
+    """
+    Yield (line number of its opening tag, dict) per <STMTTRN> entry in an OFX
+    (SGML 1.x or XML 2.x) statement. OFX carries no categories; the sign of
+    TRNAMT decides income vs expense.
+    """
+    current = None
+    start = None
+    lines = codecs.iterdecode(uploaded_file, 'utf-8', errors='replace')
+    for line_number, line in enumerate(lines, start=1):
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing:
+                    if current is not None:
+                        yield start, _ofx_row(current)
+                    current = None
+                else:
+                    current = {}
+                    start = line_number
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+    if current:
+        yield start, _ofx_row(current)
+
+
+def _ofx_row(entry):
+    return {
+        'date': entry.get('DTPOSTED', '')[:8],
+        'description': entry.get('NAME') or entry.get('MEMO') or entry.get('FITID', ''),
+        'amount': entry.get('TRNAMT', ''),
+        'category': '',
+        'transaction_type': '',
+    }
+
+
+PARSERS = {
+    'csv': iter_csv_rows,
+    'ofx': iter_ofx_rows,
+}
+
+
+class TransactionImporter:
+    """
+    Validates parsed rows against the user's categories and writes them with
+    bulk_create in batches. Invalid rows are reported and skipped; they never
+    abort the rest of the file. A file that cannot be decoded or parsed stops
+    the import at that point and is reported under 'file'.
+    """
+
+    def __init__(self, user, batch_size=500):
+        self.user = user
+        self.batch_size = batch_size
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.file_error = None
+        # One lookup for every category the user owns, keyed by (name, type)
+        self.categories = {
+            (name.lower(), transaction_type): pk
+            for pk, name, transaction_type in Category.objects.filter(user=user).values_list(
+                'id', 'name', 'transaction_type'
+            )
+        }
+
+    def run(self, rows):
+        batch = []
+        try:
+            for line_number, row in rows:
+                txn, errors = self.build(row)
+                if errors:
+                    self.add_error(line_number, errors)
+                    continue
+                batch.append(txn)
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+        except UnicodeDecodeError:
+            self.file_error = 'The file is not UTF-8 encoded text. Export it as UTF-8 and try again.'
+        except csv.Error as exc:
+            self.file_error = f'The file is not valid CSV: {exc}.'
+        if batch:
+            self.flush(batch)
+        result = {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+        if self.file_error:
+            result['file'] = self.file_error
+        return result
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line_number, 'errors': errors})
+
+    def build(self, row):
+        errors = {}
+
+        day = parse_import_date(row.get('date', ''))
+        if day is None:
+            errors['date'] = 'Unrecognised date.'
+
+        amount = None
+        raw_amount = row.get('amount', '').replace(',', '').replace(' ', '')
+        try:
+            amount = Decimal(raw_amount)
+            # NaN would pass quantize and only fail later in a comparison
+            if not amount.is_finite():
+                raise InvalidOperation
+            amount = amount.quantize(Decimal('0.01'))
+        except (InvalidOperation, ValueError):
+            amount = None
+            errors['amount'] = 'A valid number is required.'
+
+        transaction_type = row.get('transaction_type', '').strip().lower()
+        if not transaction_type and amount is not None:
+            transaction_type = 'expense' if amount < 0 else 'income'
+        if transaction_type not in TRANSACTION_TYPES:
+            errors['transaction_type'] = f'"{transaction_type}" is not a valid choice.'
+
+        if amount is not None:
+            amount = abs(amount)
+            if amount == 0 or amount > MAX_AMOUNT:
+                errors['amount'] = 'Amount must be non-zero and fit in 12 digits.'
+
+        description = row.get('description', '').strip()
+        if not description:
+            errors['description'] = 'This field may not be blank.'
+        elif len(description) > 255:
+            description = description[:255]
+
+        category_id = None
+        if 'transaction_type' not in errors:
+            category_name = row.get('category', '').strip() or 'Other'
+            category_id = self.categories.get((category_name.lower(), transaction_type))
+            if category_id is None:
+                errors['category'] = f'No {transaction_type} category named "{category_name}".'
+
+        if errors:
+            return None, errors
+        return Transaction(
+            user=self.user,
+            category_id=category_id,
+            amount=amount,
+            description=description,
+            date=day,
+            transaction_type=transaction_type,
+        ), None
+
+    def flush(self, batch):
+        deltas = defaultdict(lambda: (Decimal('0'), 0))
+        for txn in batch:
+            key = rollups.rollup_key(txn)
+            amount, count = deltas[key]
+            deltas[key] = (amount + txn.amount, count + 1)
+
+        with transaction.atomic():
+            Transaction.objects.bulk_create(batch)
+            rollups.apply_deltas(deltas)
+            mark_user_data_changed(self.user.id)
+        self.created += len(batch)
+
+
+def parse_import_date(value):
+    value = (value or '').strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,223 @@
+import datetime
+import json
+import math
+import platform
+import random
+import statistics
+import time
+from decimal import Decimal
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from budget.models import Budget, Category, Debt, SavingsGoal, Transaction
+from budget.rollups import rebuild_monthly_totals
+
+User = get_user_model()
+
+# (name, url name, query params). Names are stable so result files can be diffed across releases.
+ENDPOINTS = [
+    ('transactions.list', 'transaction-list', {}),
+    ('transactions.page', 'transaction-list', {'page_size': 50}),
+    ('transactions.expenses', 'transaction-expenses', {}),
+    ('transactions.incomes', 'transaction-incomes', {}),
+    ('transactions.savings', 'transaction-savings', {}),
+    ('categories.list', 'category-list', {}),
+    ('categories.expense', 'category-expense-categories', {}),
+    ('budgets.list', 'budget-list', {}),
+    ('savings_goals.list', 'savings-goal-list', {}),
+    ('debts.list', 'debt-list', {}),
+    ('summary', 'summary', {}),
+    ('reports.monthly', 'report-monthly', {}),
+    ('accounts.me', 'user-me', {}),
+    ('accounts.notifications', 'notification-settings', {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds synthetic data into a throwaway test database and reports latency, '
+        'SQL query counts and response sizes for the API endpoints as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[1000],
+                            help='Transactions per user to benchmark at, e.g. 1000 10000 100000')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Only run endpoints with this name (repeatable)')
+        parser.add_argument('--cold-cache', action='store_true', help='Clear the cache before every request')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for synthetic data')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--baseline', help='Compare against a previous JSON report and print the ratios')
+
+    def handle(self, *args, **options):
+        endpoints = ENDPOINTS
+        if options['endpoints']:
+            endpoints = [e for e in ENDPOINTS if e[0] in options['endpoints']]
+            if not endpoints:
+                raise CommandError(f"No endpoints match {options['endpoints']}")
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = []
+            for scale in options['scales']:
+                self.stderr.write(f'Seeding {scale} transactions...')
+                user = self.seed(scale, random.Random(options['seed']))
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+                for endpoint in endpoints:
+                    results.append(self.measure(client, scale, endpoint, options))
+                    self.stderr.write(self.format_row(results[-1]))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'iterations': options['iterations'],
+                'cold_cache': options['cold_cache'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(payload + '\n')
+        else:
+            self.stdout.write(payload)
+
+        if options['baseline']:
+            self.compare(options['baseline'], results)
+
+    def seed(self, scale, rng):
+        User.objects.all().delete()
+        user = User.objects.create_user(
+            username=f'bench_{scale}', email=f'bench_{scale}@example.com', password='benchmark-password'
+        )
+        categories = list(Category.objects.filter(user=user))
+        by_type = {}
+        for category in categories:
+            by_type.setdefault(category.transaction_type, []).append(category)
+
+        today = datetime.date.today()
+        weights = [('expense', 0.8), ('income', 0.1), ('savings', 0.1)]
+        batch = []
+        for i in range(scale):
+            transaction_type = rng.choices([t for t, _ in weights], [w for _, w in weights])[0]
+            batch.append(Transaction(
+                user=user,
+                category=rng.choice(by_type[transaction_type]),
+                amount=Decimal(rng.randint(100, 500000)) / 100,
+                description=f'Synthetic {transaction_type} {i}',
+                date=today - datetime.timedelta(days=rng.randint(0, 3 * 365)),
+                transaction_type=transaction_type,
+            ))
+            if len(batch) >= 5000:
+                Transaction.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Transaction.objects.bulk_create(batch)
+        rebuild_monthly_totals(users=[user])
+
+        for category in by_type['expense'][:5]:
+            Budget.objects.create(user=user, category=category, amount=Decimal('500.00'),
+                                  period=rng.choice(['weekly', 'monthly', 'yearly']),
+                                  start_date=today - datetime.timedelta(days=400))
+        for category in by_type['savings'][:5]:
+            SavingsGoal.objects.create(user=user, category=category, title=f'Goal {category.name}',
+                                       target_amount=Decimal('10000.00'),
+                                       start_date=today - datetime.timedelta(days=365))
+        for i in range(10):
+            Debt.objects.create(user=user, title=f'Debt {i}', person=f'Person {i}',
+                                debt_type=rng.choice(['i_owe', 'owed_to_me']),
+                                total_amount=Decimal('1000.00'), paid_amount=Decimal(rng.randint(0, 1000)),
+                                due_date=today + datetime.timedelta(days=rng.randint(-60, 60)))
+        return user
+
+    def measure(self, client, scale, endpoint, options):
+        name, url_name, params = endpoint
+        path = reverse(url_name)
+
+        def request():
+            if options['cold_cache']:
+                cache.clear()
+            response = client.get(path, params, secure=True)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            return response.status_code, size
+
+        for _ in range(options['warmup']):
+            request()
+
+        timings = []
+        queries = []
+        for _ in range(options['iterations']):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                status_code, size = request()
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(ctx))
+
+        return {
+            'endpoint': name,
+            'path': path,
+            'scale': scale,
+            'status': status_code,
+            'bytes': size,
+            'queries': max(queries),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+        }
+
+    def format_row(self, row):
+        return (
+            f"{row['scale']:>7} {row['endpoint']:<24} {row['status']} "
+            f"p50={row['p50_ms']:.2f}ms p95={row['p95_ms']:.2f}ms "
+            f"queries={row['queries']} bytes={row['bytes']}"
+        )
+
+    def compare(self, baseline_path, results):
+        with open(baseline_path) as fh:
+            baseline = {(r['scale'], r['endpoint']): r for r in json.load(fh)['results']}
+        self.stderr.write('\nscale   endpoint                 p50 ratio  p95 ratio  queries  bytes')
+        for row in results:
+            old = baseline.get((row['scale'], row['endpoint']))
+            if old is None:
+                continue
+            self.stderr.write(
+                f"{row['scale']:>7} {row['endpoint']:<24} "
+                f"{ratio(row['p50_ms'], old['p50_ms']):>9} {ratio(row['p95_ms'], old['p95_ms']):>10} "
+                f"{old['queries']:>3}->{row['queries']:<3} {old['bytes']}->{row['bytes']}"
+            )
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile; stable for the small sample sizes used here
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def ratio(new, old):
+    if not old:
+        return 'n/a'
+    return f'{new / old:.2f}x'
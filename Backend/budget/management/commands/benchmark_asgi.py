@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .benchmark_api import Command as BenchmarkApiCommand, percentile, ratio
+
+SERVERS = ['wsgi', 'asgi']
+
+# The dashboard's fan-out: what one page load requests in parallel
+ENDPOINTS = [
+    ('summary', 'summary', ''),
+    ('transactions.page', 'transaction-list', 'page_size=50'),
+    ('transactions.expenses', 'transaction-expenses', ''),
+    ('transactions.incomes', 'transaction-incomes', ''),
+    ('categories.list', 'category-list', ''),
+    ('categories.expense', 'category-expense-categories', ''),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares requests/sec of the WSGI and ASGI entry points under concurrent load, '
+        'replaying the dashboard\'s parallel reads in-process against a throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=2000, help='Transactions for the benchmark user')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 6, 24],
+                            help='Requests in flight at once (WSGI worker threads / ASGI tasks)')
+        parser.add_argument('--requests', type=int, default=300, help='Timed requests per concurrency level')
+        parser.add_argument('--db-latency', type=float, default=0.0,
+                            help='Milliseconds added to every query, to model a database across the network')
+        parser.add_argument('--wsgi-workers', type=int,
+                            help='Cap on WSGI worker threads (default: one per request in flight)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for synthetic data')
+        parser.add_argument('--servers', nargs='+', choices=SERVERS, default=SERVERS,
+                            help='Entry points to measure, each in its own process')
+        parser.add_argument('--server', choices=SERVERS, help=argparse.SUPPRESS)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['server']:
+            self.stdout.write(json.dumps(self.measure_server(options['server'], options)))
+            return
+
+        runs = {server: self.run_server(server, options) for server in options['servers']}
+
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'scale': options['scale'],
+                'requests': options['requests'],
+                'seed': options['seed'],
+                'db_latency_ms': options['db_latency'],
+                'wsgi_workers': options['wsgi_workers'],
+            },
+            'results': [row for rows in runs.values() for row in rows],
+        }
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(payload + '\n')
+        else:
+            self.stdout.write(payload)
+
+        if len(runs) == len(SERVERS):
+            self.stderr.write('\nconcurrency  asgi/wsgi req/s')
+            for wsgi_row, asgi_row in zip(runs['wsgi'], runs['asgi']):
+                self.stderr.write(
+                    f"{wsgi_row['concurrency']:>11}  {ratio(asgi_row['requests_per_sec'], wsgi_row['requests_per_sec'])}"
+                )
+
+    def run_server(self, server, options):
+        # urls.py picks the async views at import time, so each entry point gets a fresh interpreter
+        env = dict(os.environ, ASYNC_READ_VIEWS='true' if server == 'asgi' else 'false')
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'benchmark_asgi',
+            '--server', server, '--scale', str(options['scale']), '--requests', str(options['requests']),
+            '--seed', str(options['seed']), '--db-latency', str(options['db_latency']),
+            '--concurrency', *[str(c) for c in options['concurrency']],
+        ]
+        if options['wsgi_workers']:
+            command += ['--wsgi-workers', str(options['wsgi_workers'])]
+        proc = subprocess.run(command, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise CommandError(f'{server} run failed:\n{proc.stderr.strip()}')
+        rows = json.loads(proc.stdout)
+        for row in rows:
+            self.stderr.write(self.format_row(row))
+        return rows
+
+    def measure_server(self, server, options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = BenchmarkApiCommand().seed(options['scale'], random.Random(options['seed']))
+            token = str(RefreshToken.for_user(user).access_token)
+            requests = [(reverse(url_name), query) for _, url_name, query in ENDPOINTS]
+            if server == 'wsgi':
+                send = self.wsgi_sender(token, options['wsgi_workers'])
+            else:
+                send = self.asgi_sender(token)
+            if options['db_latency']:
+                self.add_db_latency(options['db_latency'] / 1000)
+
+            # One sequential pass warms the caches and fails fast on a broken endpoint
+            for (name, _, _), (path, query) in zip(ENDPOINTS, requests):
+                status, body = send([(path, query)], 1)[0][:2]
+                if status != 200:
+                    raise CommandError(f'{name} returned {status}: {body[:200]!r}')
+
+            results = []
+            for concurrency in options['concurrency']:
+                batch = [requests[i % len(requests)] for i in range(options['requests'])]
+                start = time.perf_counter()
+                responses = send(batch, concurrency)
+                elapsed = time.perf_counter() - start
+                timings = [ms for _, _, ms in responses]
+                results.append({
+                    'server': server,
+                    'concurrency': concurrency,
+                    'requests_per_sec': round(len(batch) / elapsed, 1),
+                    'p50_ms': round(percentile(timings, 50), 3),
+                    'p95_ms': round(percentile(timings, 95), 3),
+                    'errors': sum(1 for status, _, _ in responses if status != 200),
+                })
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        return results
+
+    def add_db_latency(self, seconds):
+        # Every request opens its own connection, so hook each one as it is created
+        def wait(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def hook(sender, connection, **kwargs):
+            connection.execute_wrappers.append(wait)
+
+        connection_created.connect(hook, weak=False)
+
+    def wsgi_sender(self, token, workers=None):
+        # Each worker thread runs the full WSGI handler, as a threaded WSGI server would
+        application = WSGIHandler()
+
+        def request(path, query):
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'SCRIPT_NAME': '',
+                'PATH_INFO': path,
+                'QUERY_STRING': query,
+                'SERVER_NAME': 'testserver',
+                'SERVER_PORT': '443',
+                'HTTP_HOST': 'testserver',
+                'HTTP_AUTHORIZATION': f'Bearer {token}',
+                'wsgi.url_scheme': 'https',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+            }
+            status = []
+            start = time.perf_counter()
+            result = application(environ, lambda line, headers, exc_info=None: status.append(line))
+            try:
+                body = b''.join(result)
+            finally:
+                result.close()
+            return int(status[0].split()[0]), body, (time.perf_counter() - start) * 1000
+
+        def send(batch, concurrency):
+            with ThreadPoolExecutor(max_workers=min(concurrency, workers or concurrency)) as pool:
+                return list(pool.map(lambda item: request(*item), batch))
+
+        return send
+
+    def asgi_sender(self, token):
+        # All requests share one event loop, as under a single ASGI server worker
+        application = ASGIHandler()
+
+        async def request(path, query):
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'https',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': query.encode(),
+                'root_path': '',
+                'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+                'server': ('testserver', 443),
+                'client': ('127.0.0.1', 0),
+            }
+            received = False
+            messages = []
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # The client never disconnects; the handler cancels this wait when it responds
+                await asyncio.Event().wait()
+
+            async def send(message):
+                messages.append(message)
+
+            start = time.perf_counter()
+            await application(scope, receive, send)
+            elapsed = (time.perf_counter() - start) * 1000
+            body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+            return messages[0]['status'], body, elapsed
+
+        async def run(batch, concurrency):
+            limit = asyncio.Semaphore(concurrency)
+
+            async def limited(item):
+                async with limit:
+                    return await request(*item)
+
+            return await asyncio.gather(*(limited(item) for item in batch))
+
+        def send(batch, concurrency):
+            return asyncio.run(run(batch, concurrency))
+
+        return send
+
+    def format_row(self, row):
+        return (
+            f"{row['server']:<5} concurrency={row['concurrency']:<3} {row['requests_per_sec']:>8.1f} req/s "
+            f"p50={row['p50_ms']:.3f}ms p95={row['p95_ms']:.3f}ms errors={row['errors']}"
+        )
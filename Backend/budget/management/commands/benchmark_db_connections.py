@@ -0,0 +1,117 @@
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import django
+from django.conf import settings
+from django.core import signals
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from .benchmark_api import percentile, ratio
+
+MODES = ['serverless', 'persistent', 'pool']
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures per-request database connection cost under the DB_CONNECTION_MODE settings '
+        'by replaying the request_started/request_finished cycle around a trivial query'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Timed simulated requests')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed simulated requests')
+        parser.add_argument('--modes', nargs='+', choices=MODES,
+                            help='Run each mode in its own process instead of only the configured one')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['modes']:
+            results = [self.run_mode(mode, options) for mode in options['modes']]
+        else:
+            results = [self.measure(options)]
+
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'requests': options['requests'],
+            },
+            'results': results,
+        }
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(payload + '\n')
+        else:
+            self.stdout.write(payload)
+
+        if len(results) > 1:
+            base = results[0]
+            self.stderr.write(f"\nmode         p50 vs {base['mode']:<11} p95 vs {base['mode']:<11} connections")
+            for row in results:
+                self.stderr.write(
+                    f"{row['mode']:<12} {ratio(row['p50_ms'], base['p50_ms']):>18} "
+                    f"{ratio(row['p95_ms'], base['p95_ms']):>18} {row['connections']}"
+                )
+
+    def run_mode(self, mode, options):
+        # Settings are read once per process, so each mode gets a fresh interpreter
+        env = dict(os.environ, DB_CONNECTION_MODE=mode)
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'benchmark_db_connections',
+            '--requests', str(options['requests']), '--warmup', str(options['warmup']),
+        ]
+        proc = subprocess.run(command, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise CommandError(f'{mode} run failed:\n{proc.stderr.strip()}')
+        result = json.loads(proc.stdout)['results'][0]
+        self.stderr.write(self.format_row(result))
+        return result
+
+    def measure(self, options):
+        # On PostgreSQL the backend pid tells how many physical connections were opened
+        query = 'SELECT pg_backend_pid()' if connection.vendor == 'postgresql' else 'SELECT 1'
+
+        def request():
+            signals.request_started.send(sender=self.__class__)
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(query)
+                    return cursor.fetchone()[0]
+            finally:
+                signals.request_finished.send(sender=self.__class__)
+
+        for _ in range(options['warmup']):
+            request()
+
+        timings = []
+        backends = set()
+        for _ in range(options['requests']):
+            start = time.perf_counter()
+            backends.add(request())
+            timings.append((time.perf_counter() - start) * 1000)
+        close_old_connections()
+
+        return {
+            'mode': getattr(settings, 'DB_CONNECTION_MODE', 'serverless'),
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'connections': len(backends) if connection.vendor == 'postgresql' else None,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+        }
+
+    def format_row(self, row):
+        return (
+            f"{row['mode']:<12} p50={row['p50_ms']:.3f}ms p95={row['p95_ms']:.3f}ms "
+            f"connections={row['connections']}"
+        )
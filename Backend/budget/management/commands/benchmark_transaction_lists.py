@@ -0,0 +1,106 @@
+import datetime
+import json
+import platform
+import random
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+
+from budget.models import Transaction
+from budget.serializers import TransactionListSerializer, TransactionSerializer, transaction_values
+
+from .benchmark_api import Command as BenchmarkApiCommand, percentile, ratio
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares rendering a user\'s full transaction list through TransactionSerializer '
+        'with the values() fast path, checking that both produce identical JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[10000],
+                            help='Transactions per user to benchmark at')
+        parser.add_argument('--iterations', type=int, default=10, help='Timed runs per path')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for synthetic data')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        paths = [
+            ('model', self.render_model),
+            ('values', self.render_values),
+        ]
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = []
+            for scale in options['scales']:
+                self.stderr.write(f'Seeding {scale} transactions...')
+                user = BenchmarkApiCommand().seed(scale, random.Random(options['seed']))
+                outputs = {}
+                for name, render in paths:
+                    row, outputs[name] = self.measure(name, render, user, scale, options['iterations'])
+                    results.append(row)
+                if outputs['model'] != outputs['values']:
+                    raise CommandError(f'Fast path output differs from TransactionSerializer at scale {scale}')
+                self.stderr.write(
+                    f"{scale:>7} identical output, values/model p50 "
+                    f"{ratio(results[-1]['p50_ms'], results[-2]['p50_ms'])}"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(payload + '\n')
+        else:
+            self.stdout.write(payload)
+
+    def render_model(self, user):
+        # What TransactionViewSet.list did before the fast path
+        qs = Transaction.objects.filter(user=user).select_related('category', 'user')
+        return JSONRenderer().render(TransactionSerializer(qs, many=True).data)
+
+    def render_values(self, user):
+        qs = Transaction.objects.filter(user=user)
+        return JSONRenderer().render(TransactionListSerializer(transaction_values(qs), many=True).data)
+
+    def measure(self, name, render, user, scale, iterations):
+        output = render(user)  # warm-up, also kept for the equality check
+        timings = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                render(user)
+                timings.append((time.perf_counter() - start) * 1000)
+        row = {
+            'path': name,
+            'scale': scale,
+            'bytes': len(output),
+            'queries': len(ctx),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+        }
+        self.stderr.write(f"{scale:>7} {name:<7} p50={row['p50_ms']:.2f}ms p95={row['p95_ms']:.2f}ms bytes={row['bytes']}")
+        return row, output
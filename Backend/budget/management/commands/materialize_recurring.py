@@ -0,0 +1,26 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from budget.recurring import materialize_due
+
+
+class Command(BaseCommand):
+    help = 'Creates the transactions for every due recurring rule and advances their schedules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Materialize occurrences up to this date (YYYY-MM-DD, default today)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rules locked and processed per transaction')
+
+    def handle(self, *args, **options):
+        today = datetime.date.today()
+        if options['date']:
+            today = parse_date(options['date'])
+            if today is None:
+                raise CommandError('--date must be YYYY-MM-DD')
+
+        rules, created = materialize_due(today, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized {created} transactions from {rules} recurring rules up to {today}'
+        ))
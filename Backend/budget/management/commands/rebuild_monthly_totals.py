@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from budget.cache import mark_users_data_changed
+from budget.rollups import rebuild_monthly_totals
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Rebuilds the MonthlyCategoryTotal rollup table from the transactions table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='usernames', help='Only rebuild for this username (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        users = None
+        if options['usernames']:
+            users = list(User.objects.filter(username__in=options['usernames']))
+            missing = set(options['usernames']) - {user.username for user in users}
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+
+        with transaction.atomic():
+            written = rebuild_monthly_totals(users=users, batch_size=options['batch_size'])
+            # /monthly-totals/ reads the rollup, so its cached copies and ETags must change
+            mark_users_data_changed(None if users is None else [user.id for user in users])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt monthly totals: {written} rows written'))
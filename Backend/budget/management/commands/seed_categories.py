@@ -1,33 +1,28 @@
 from django.core.management.base import BaseCommand
-from django.contrib.auth import get_user_model
-from budget.models import Category
+from django.db import transaction
+from budget.cache import mark_users_data_changed
+from budget.provisioning import provision_default_categories, users_without_categories
 
-User = get_user_model()
 
 class Command(BaseCommand):
     help = 'Seeds default categories for users who do not have them'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Users seeded per bulk insert')
+
     def handle(self, *args, **options):
-        users = User.objects.all()
-        
-        default_categories = {
-            'income': ['Salary', 'Freelance', 'Investments', 'Other'],
-            'expense': ['Food', 'Transport', 'Utilities', 'Rent', 'Entertainment', 'Health', 'Shopping', 'Other'],
-            'savings': ['Emergency Fund', 'Retirement', 'Vacation', 'Home', 'Car', 'Other']
-        }
+        batch_size = options['batch_size']
+        users = list(users_without_categories().values_list('id', 'username'))
+
+        if not users:
+            self.stdout.write('All users already have categories. Skipping.')
+            return
 
-        for user in users:
-            if not Category.objects.filter(user=user).exists():
-                self.stdout.write(f'Seeding categories for user: {user.username}')
-                
-                for cat_type, names in default_categories.items():
-                    for name in names:
-                        Category.objects.create(
-                            name=name,
-                            transaction_type=cat_type,
-                            user=user,
-                            is_default=True
-                        )
-                self.stdout.write(self.style.SUCCESS(f'Successfully seeded categories for {user.username}'))
-            else:
-                self.stdout.write(f'User {user.username} already has categories. Skipping.')
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            with transaction.atomic():
+                created = provision_default_categories([user_id for user_id, _ in batch])
+                mark_users_data_changed([user_id for user_id, _ in batch])
+            for _, username in batch:
+                self.stdout.write(f'Seeding categories for user: {username}')
+            self.stdout.write(self.style.SUCCESS(f'Successfully seeded {created} categories for {len(batch)} users'))
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# Text indexes for TransactionViewSet.search (see budget/search.py).
+#
+# PostgreSQL: a GIN index on to_tsvector('simple', description) for word and
+# prefix matches plus a pg_trgm GIN index for substring (ILIKE) matches. Both
+# are built CONCURRENTLY so large tables stay writable, hence atomic = False.
+#
+# SQLite (local development): an external-content FTS5 table kept in sync by
+# triggers. SQLite rebuilds a table on most ALTERs, which drops its triggers,
+# so a later migration that alters budget_transaction must recreate them.
+
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS transaction_description_fts_idx "
+    "ON budget_transaction USING gin (to_tsvector('simple', description))",
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS transaction_description_trgm_idx '
+    'ON budget_transaction USING gin (description gin_trgm_ops)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX CONCURRENTLY IF EXISTS transaction_description_trgm_idx',
+    'DROP INDEX CONCURRENTLY IF EXISTS transaction_description_fts_idx',
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS budget_transaction_fts USING fts5("
+    "description, content='budget_transaction', content_rowid='id', tokenize='unicode61')",
+    'CREATE TRIGGER IF NOT EXISTS budget_transaction_fts_ai AFTER INSERT ON budget_transaction BEGIN '
+    'INSERT INTO budget_transaction_fts(rowid, description) VALUES (new.id, new.description); END',
+    'CREATE TRIGGER IF NOT EXISTS budget_transaction_fts_ad AFTER DELETE ON budget_transaction BEGIN '
+    "INSERT INTO budget_transaction_fts(budget_transaction_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); END",
+    'CREATE TRIGGER IF NOT EXISTS budget_transaction_fts_au AFTER UPDATE OF description ON budget_transaction BEGIN '
+    "INSERT INTO budget_transaction_fts(budget_transaction_fts, rowid, description) "
+    "VALUES ('delete', old.id, old.description); "
+    'INSERT INTO budget_transaction_fts(rowid, description) VALUES (new.id, new.description); END',
+    "INSERT INTO budget_transaction_fts(budget_transaction_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS budget_transaction_fts_au',
+    'DROP TRIGGER IF EXISTS budget_transaction_fts_ad',
+    'DROP TRIGGER IF EXISTS budget_transaction_fts_ai',
+    'DROP TABLE IF EXISTS budget_transaction_fts',
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgres, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('budget', '0008_userdatawatermark'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# budget/search.py no longer ORs an ILIKE substring match into the tsvector
+# search, so the trigram index from 0009 has no queries left to serve.
+# PostgreSQL only; dropped CONCURRENTLY, hence atomic = False.
+
+POSTGRES_FORWARD = [
+    'DROP INDEX CONCURRENTLY IF EXISTS transaction_description_trgm_idx',
+]
+
+POSTGRES_REVERSE = [
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS transaction_description_trgm_idx '
+    'ON budget_transaction USING gin (description gin_trgm_ops)',
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('budget', '0011_debt_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgres(POSTGRES_FORWARD), run_on_postgres(POSTGRES_REVERSE)),
+    ]
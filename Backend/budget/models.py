@@ -103,6 +103,79 @@ class Debt(models.Model):
 
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['user', 'due_date'], name='debt_user_due_idx'),  # Overdue lookups
+            models.Index(fields=['user', '-updated_at'], name='debt_user_updated_idx'),  # Default ordering
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.person}"
+
+
+# Per-user monthly totals for each category and transaction type.
+# Maintained in the same DB transaction as Transaction writes (see budget.rollups)
+class MonthlyCategoryTotal(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_totals')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='monthly_totals')
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    month = models.DateField()  # First day of the month
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'category', 'transaction_type', 'month'],
+                name='unique_monthly_category_total',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'month'], name='user_month_idx'),
+        ]
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.category_id} {self.transaction_type} - {self.total}"
+
+
+# Per-user change watermark, bumped by every write to the user's budget data.
+# Drives cache key versions and ETag / Last-Modified on read endpoints
+class UserDataWatermark(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_watermark')
+    version = models.BigIntegerField(default=1)
+    modified_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
+# Rule that creates a transaction every cadence period (rent, salary, subscriptions).
+# `next_run` is the date of the next occurrence still to be created; see
+# budget.recurring and the materialize_recurring command
+class RecurringTransaction(models.Model):
+    CADENCE_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recurring_transactions')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='recurring_transactions')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    description = models.CharField(max_length=255)
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    cadence = models.CharField(max_length=10, choices=CADENCE_CHOICES, default='monthly')
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    next_run = models.DateField()
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['active', 'next_run'], name='recurring_due_idx'),
+        ]
+        ordering = ['next_run']
+
+    def __str__(self):
+        return f"{self.description} - {self.amount} ({self.cadence})"
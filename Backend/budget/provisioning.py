@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
+
+from .models import Category
+
+User = get_user_model()
+
+DEFAULT_CATEGORIES = {
+    'income': ['Salary', 'Freelance', 'Investments', 'Other'],
+    'expense': ['Food', 'Transport', 'Utilities', 'Rent', 'Entertainment', 'Health', 'Shopping', 'Other'],
+    'savings': ['Emergency Fund', 'Retirement', 'Vacation', 'Home', 'Car', 'Other']
+}
+
+
+def users_without_categories():
+    # Single anti-join instead of an exists() query per user
+    return User.objects.filter(~Exists(Category.objects.filter(user=OuterRef('pk'))))
+
+
+def provision_default_categories(users, batch_size=1000):
+    """
+    Create the default categories for every given user with one bulk INSERT per batch.
+    Returns the number of categories created.
+    """
+    categories = [
+        Category(name=name, transaction_type=cat_type, user_id=getattr(user, 'pk', user), is_default=True)
+        for user in users
+        for cat_type, names in DEFAULT_CATEGORIES.items()
+        for name in names
+    ]
+    Category.objects.bulk_create(categories, batch_size=batch_size)
+    return len(categories)
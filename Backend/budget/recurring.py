@@ -0,0 +1,121 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from .aggregates import add_months
+from .cache import mark_user_data_changed
+from .models import RecurringTransaction, Transaction
+from .rollups import apply_deltas, rollup_key
+
+CADENCE_MONTHS = {'monthly': 1, 'yearly': 12}
+CADENCE_DAYS = {'daily': 1, 'weekly': 7}
+
+# Occurrences created per rule per pass. A rule further behind than this
+# (e.g. a daily rule paused for years) stays due and continues on the next batch
+MAX_CATCH_UP = 366
+
+
+def next_occurrence(rule, day):
+    """
+    First occurrence of `rule` after `day`. Every cadence stays anchored to
+    start_date, so a monthly rule starting on the 31st lands on the last day
+    of shorter months and returns to the 31st afterwards.
+    """
+    start = rule.start_date
+    if day < start:
+        return start
+    if rule.cadence in CADENCE_DAYS:
+        step = CADENCE_DAYS[rule.cadence]
+        elapsed = (day - start).days
+        return start + datetime.timedelta(days=elapsed - elapsed % step + step)
+    step = CADENCE_MONTHS[rule.cadence]
+    months = (day.year - start.year) * 12 + day.month - start.month
+    months -= months % step
+    candidate = add_months(start, months)
+    while candidate <= day:
+        months += step
+        candidate = add_months(start, months)
+    return candidate
+
+
+def first_occurrence_on_or_after(rule, day):
+    return next_occurrence(rule, day - datetime.timedelta(days=1))
+
+
+def due_dates(rule, today):
+    dates = []
+    day = rule.next_run
+    while day <= today and len(dates) < MAX_CATCH_UP:
+        if rule.end_date and day > rule.end_date:
+            break
+        dates.append(day)
+        day = next_occurrence(rule, day)
+    return dates, day
+
+
+def materialize_batch(today, batch_size):
+    """
+    Create the transactions for one batch of due rules and advance their
+    schedules, all in one database transaction. Returns (rules, transactions).
+
+    Rows are locked with SKIP LOCKED, so concurrent runs split the work, and a
+    run that fails part-way leaves nothing behind; either way no occurrence is
+    created twice.
+    """
+    with transaction.atomic():
+        rules = list(
+            RecurringTransaction.objects.select_for_update(skip_locked=True)
+            .filter(active=True, next_run__lte=today)
+            .select_related('category')
+            .order_by('next_run', 'id')[:batch_size]
+        )
+        if not rules:
+            return 0, 0
+
+        created = []
+        deltas = defaultdict(lambda: (Decimal('0'), 0))
+        for rule in rules:
+            if rule.category.user_id != rule.user_id:
+                # Never write into one user's ledger with another user's category
+                rule.active = False
+                continue
+            dates, rule.next_run = due_dates(rule, today)
+            if rule.end_date and rule.next_run > rule.end_date:
+                rule.active = False
+            for day in dates:
+                txn = Transaction(
+                    user_id=rule.user_id,
+                    category_id=rule.category_id,
+                    amount=rule.amount,
+                    description=rule.description,
+                    date=day,
+                    transaction_type=rule.transaction_type,
+                )
+                created.append(txn)
+                amount, count = deltas[rollup_key(txn)]
+                deltas[rollup_key(txn)] = (amount + txn.amount, count + 1)
+
+        Transaction.objects.bulk_create(created, batch_size=1000)
+        RecurringTransaction.objects.bulk_update(rules, ['next_run', 'active'])
+        apply_deltas(deltas)
+        for user_id in {rule.user_id for rule in rules}:
+            mark_user_data_changed(user_id)
+    return len(rules), len(created)
+
+
+def materialize_due(today=None, batch_size=500):
+    """
+    Materialize every due occurrence of every active rule up to `today`.
+    Cost is proportional to the number of due rules, not to all rules.
+    """
+    today = today or datetime.date.today()
+    total_rules = total_created = 0
+    while True:
+        rules, created = materialize_batch(today, batch_size)
+        if not rules:
+            break
+        total_rules += rules
+        total_created += created
+    return total_rules, total_created
@@ -0,0 +1,133 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import MonthlyCategoryTotal, Transaction
+
+
+def rollup_key(txn):
+    return (txn.user_id, txn.category_id, txn.transaction_type, txn.date.replace(day=1))
+
+
+def apply_deltas(deltas):
+    """
+    Apply {(user_id, category_id, transaction_type, month): (amount, count)} deltas
+    to MonthlyCategoryTotal. Call inside the transaction that changed the rows.
+    """
+    emptied = []
+    for (user_id, category_id, transaction_type, month), (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+        key = {
+            'user_id': user_id,
+            'category_id': category_id,
+            'transaction_type': transaction_type,
+            'month': month,
+        }
+        updated = MonthlyCategoryTotal.objects.filter(**key).update(
+            total=F('total') + amount,
+            count=F('count') + count,
+        )
+        if not updated:
+            row, created = MonthlyCategoryTotal.objects.get_or_create(
+                **key, defaults={'total': amount, 'count': max(count, 0)}
+            )
+            if not created:
+                # Lost a race with a concurrent insert of the same bucket
+                MonthlyCategoryTotal.objects.filter(pk=row.pk).update(
+                    total=F('total') + amount,
+                    count=F('count') + count,
+                )
+        if count < 0:
+            emptied.append(key)
+
+    # Drop buckets that no longer hold any transactions
+    for key in emptied:
+        MonthlyCategoryTotal.objects.filter(count=0, **key).delete()
+
+
+def record_created(txn):
+    apply_deltas({rollup_key(txn): (txn.amount, 1)})
+
+
+def record_deleted(txn):
+    apply_deltas({rollup_key(txn): (-txn.amount, -1)})
+
+
+def record_updated(old_key, old_amount, txn):
+    deltas = defaultdict(lambda: (Decimal('0'), 0))
+    amount, count = deltas[old_key]
+    deltas[old_key] = (amount - old_amount, count - 1)
+    new_key = rollup_key(txn)
+    amount, count = deltas[new_key]
+    deltas[new_key] = (amount + txn.amount, count + 1)
+    apply_deltas(deltas)
+
+
+def combine_deltas(*parts):
+    # Sum delta dicts so a bucket touched by several parts is written once
+    deltas = defaultdict(lambda: (Decimal('0'), 0))
+    for part in parts:
+        for key, (amount, count) in part.items():
+            total, rows = deltas[key]
+            deltas[key] = (total + amount, rows + count)
+    return deltas
+
+
+def grouped_totals(queryset):
+    # One grouped query yielding a row per (user, category, type, month) bucket
+    return (
+        queryset.order_by()
+        .annotate(month=TruncMonth('date'))
+        .values('user_id', 'category_id', 'transaction_type', 'month')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+
+
+def deltas_for_queryset(queryset, sign=1):
+    return {
+        (row['user_id'], row['category_id'], row['transaction_type'], row['month']): (
+            sign * row['total'], sign * row['count']
+        )
+        for row in grouped_totals(queryset)
+    }
+
+
+def rebuild_monthly_totals(users=None, batch_size=1000):
+    """
+    Recompute MonthlyCategoryTotal from scratch, for all users or only `users`.
+    Returns the number of rollup rows written.
+    """
+    rollups = MonthlyCategoryTotal.objects.all()
+    transactions = Transaction.objects.all()
+    if users is not None:
+        rollups = rollups.filter(user__in=users)
+        transactions = transactions.filter(user__in=users)
+
+    rollups.delete()
+    rows = (
+        MonthlyCategoryTotal(
+            user_id=row['user_id'],
+            category_id=row['category_id'],
+            transaction_type=row['transaction_type'],
+            month=row['month'],
+            total=row['total'],
+            count=row['count'],
+        )
+        for row in grouped_totals(transactions).iterator()
+    )
+
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            MonthlyCategoryTotal.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        MonthlyCategoryTotal.objects.bulk_create(batch)
+        written += len(batch)
+    return written
@@ -0,0 +1,67 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+
+# Ranked description search backed by the indexes from migration 0009: a
+# tsvector GIN index on PostgreSQL, an FTS5 table on SQLite. Both match whole
+# words and word prefixes only, so every backend returns the same rows.
+
+MAX_TERMS = 8
+
+
+def search_terms(query):
+    """
+    Split user input into plain word tokens, so nothing the user types can be
+    interpreted as tsquery or FTS5 syntax.
+    """
+    terms = re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+    if not terms:
+        raise ValidationError({'q': 'Enter at least one word to search for.'})
+    return terms
+
+
+def search_transactions(qs, query):
+    """
+    Restrict a transaction queryset to rows whose description matches every
+    term (as a word prefix), annotate a relevance `rank` and order by it,
+    most recent first among equal ranks.
+    """
+    terms = search_terms(query)
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        match = RawSQL(
+            "to_tsvector('simple', budget_transaction.description) @@ to_tsquery('simple', %s)",
+            (tsquery,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            "ts_rank(to_tsvector('simple', budget_transaction.description), to_tsquery('simple', %s))",
+            (tsquery,),
+            output_field=FloatField(),
+        )
+    elif vendor == 'sqlite':
+        fts_query = ' '.join(f'"{term}"*' for term in terms)
+        match = RawSQL(
+            'budget_transaction.id IN (SELECT rowid FROM budget_transaction_fts '
+            'WHERE budget_transaction_fts MATCH %s)',
+            (fts_query,),
+            output_field=BooleanField(),
+        )
+        # bm25() is lower for better matches
+        rank = RawSQL(
+            '(SELECT -bm25(budget_transaction_fts) FROM budget_transaction_fts '
+            'WHERE budget_transaction_fts MATCH %s AND rowid = budget_transaction.id)',
+            (fts_query,),
+            output_field=FloatField(),
+        )
+    else:
+        # No text index on other backends; still correct, just a scan
+        for term in terms:
+            qs = qs.filter(description__icontains=term)
+        return qs.order_by('-date', '-id')
+
+    return qs.filter(match).annotate(rank=rank).order_by('-rank', '-date', '-id')
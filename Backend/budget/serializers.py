@@ -1,40 +1,239 @@
+import datetime
 from decimal import Decimal
 
 from rest_framework import serializers
 from django.db.models import Sum
+from personal_budget_manager.instrumentation import timed_serialization
 from .models import Budget, Category, Transaction
 from .models import SavingsGoal
 from .models import Debt
+from .models import RecurringTransaction
+from .aggregates import budget_progress, debt_is_overdue
+from .filters import FILTER_PARAMS
+
+
+# Serializers whose .data counts toward the request's serialize timing. Model
+# serializers below use TimedModelSerializer, and list_serializer_class covers many=True
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
 
 
 # Serializer for the Category model
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedModelSerializer):
     class Meta:
         model = Category
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'transaction_type']
 
 # Serializer for the Budget model
-class BudgetSerializer(serializers.ModelSerializer):
+class BudgetSerializer(TimedModelSerializer):
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), source='category', write_only=True)
+    period_start = serializers.SerializerMethodField()
+    period_end = serializers.SerializerMethodField()
+    spent = serializers.SerializerMethodField()
+    remaining = serializers.SerializerMethodField()
+    percent = serializers.SerializerMethodField()
 
     class Meta:
         model = Budget
-        fields = ['id', 'user', 'category', 'category_id', 'amount', 'period', 'start_date', 'created_at']
-        read_only_fields = ['id', 'user', 'created_at', 'category']
+        list_serializer_class = TimedListSerializer
+        fields = [
+            'id', 'user', 'category', 'category_id', 'amount', 'period', 'start_date', 'created_at',
+            'period_start', 'period_end', 'spent', 'remaining', 'percent',
+        ]
+        read_only_fields = [
+            'id', 'user', 'created_at', 'category',
+            'period_start', 'period_end', 'spent', 'remaining', 'percent',
+        ]
+
+    def get_progress(self, obj):
+        # BudgetViewSet passes progress for the whole list in the context; single objects compute their own
+        progress = self.context.setdefault('budget_progress', {})
+        if obj.id not in progress:
+            progress.update(budget_progress(obj.user_id, [obj]))
+        return progress[obj.id]
+
+    def get_period_start(self, obj):
+        return self.get_progress(obj)['period_start']
+
+    def get_period_end(self, obj):
+        return self.get_progress(obj)['period_end']
+
+    def get_money(self, obj, name):
+        # Strings with two decimals, like amount and the summary's budget figures
+        return str(self.get_progress(obj)[name].quantize(Decimal('0.01')))
+
+    def get_spent(self, obj):
+        return self.get_money(obj, 'spent')
+
+    def get_remaining(self, obj):
+        return self.get_money(obj, 'remaining')
+
+    def get_percent(self, obj):
+        return self.get_money(obj, 'percent')
 
 
 # Serializer for the Transaction model
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(TimedModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
 
     class Meta:
         model = Transaction
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'user', 'category', 'category_name', 'amount', 'description', 'date', 'transaction_type', 'created_at']
         read_only_fields = ['id', 'user', 'created_at', 'category_name']
 
 
-class SavingsGoalSerializer(serializers.ModelSerializer):
+# Columns read by TransactionListSerializer, in TransactionSerializer field order
+TRANSACTION_LIST_COLUMNS = (
+    'id', 'user_id', 'category_id', 'category__name', 'amount', 'description', 'date', 'transaction_type',
+    'created_at',
+)
+
+
+def transaction_values(queryset):
+    return queryset.values(*TRANSACTION_LIST_COLUMNS)
+
+
+# Read-only fast path for transaction lists. Works on dicts from
+# transaction_values() instead of model instances, and formats amount and
+# dates with TransactionSerializer's own fields, so the JSON is identical.
+class TransactionListSerializer:
+    _fields = None
+
+    def __init__(self, rows, many=True, context=None):
+        self.rows = rows
+
+    @classmethod
+    def formatters(cls):
+        if cls._fields is None:
+            fields = TransactionSerializer().fields
+            cls._fields = (
+                fields['amount'].to_representation,
+                fields['date'].to_representation,
+                fields['created_at'].to_representation,
+            )
+        return cls._fields
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return self.render_rows()
+
+    def render_rows(self):
+        amount, date, created_at = self.formatters()
+        return [
+            {
+                'id': row['id'],
+                'user': row['user_id'],
+                'category': row['category_id'],
+                'category_name': row['category__name'],
+                'amount': amount(row['amount']),
+                'description': row['description'],
+                'date': date(row['date']),
+                'transaction_type': row['transaction_type'],
+                'created_at': created_at(row['created_at']),
+            }
+            for row in self.rows
+        ]
+
+
+def is_blank(value):
+    values = value if isinstance(value, list) else [value]
+    return not any(str(item).strip(' ,') for item in values if item is not None)
+
+
+# Selects the transactions a bulk action applies to: explicit ids, the list
+# filters (FILTER_PARAMS), or every transaction of the user with "all": true
+class TransactionSelectionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = serializers.DictField(required=False, allow_empty=False)
+    all = serializers.BooleanField(required=False, default=False)
+
+    def validate_filter(self, value):
+        unknown = sorted(set(value) - FILTER_PARAMS)
+        if unknown:
+            raise serializers.ValidationError(f'Unknown filter: {", ".join(unknown)}.')
+        # Drop blank values so a filter like {"types": ""} can't quietly select everything
+        value = {key: item for key, item in value.items() if not is_blank(item)}
+        if not value:
+            raise serializers.ValidationError('The filter selects every transaction; send "all": true instead.')
+        return value
+
+    def validate(self, attrs):
+        if attrs['all']:
+            if 'ids' in attrs or 'filter' in attrs:
+                raise serializers.ValidationError('"all" can\'t be combined with "ids" or "filter".')
+        elif ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Provide either "ids" or "filter", or "all": true.')
+        return attrs
+
+
+class TransactionBulkUpdateSerializer(TransactionSelectionSerializer):
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), required=False)
+    transaction_type = serializers.ChoiceField(choices=Transaction.TRANSACTION_TYPES, required=False)
+
+    def validate_category(self, value):
+        request = self.context.get('request')
+        if request and value.user_id != request.user.id:
+            raise serializers.ValidationError('Category does not belong to the current user.')
+        return value
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if 'category' not in attrs and 'transaction_type' not in attrs:
+            raise serializers.ValidationError('Provide "category" and/or "transaction_type" to change.')
+        # With only one of the two, the view checks it against the selected rows
+        category = attrs.get('category')
+        transaction_type = attrs.get('transaction_type')
+        if category and transaction_type and category.transaction_type != transaction_type:
+            raise serializers.ValidationError({'category': 'Category type does not match the transaction type.'})
+        return attrs
+
+
+# Serializer for recurring transaction rules; next_run is managed by the server
+class RecurringTransactionSerializer(TimedModelSerializer):
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+    class Meta:
+        model = RecurringTransaction
+        list_serializer_class = TimedListSerializer
+        fields = [
+            'id', 'user', 'category', 'category_name', 'amount', 'description', 'transaction_type',
+            'cadence', 'start_date', 'end_date', 'next_run', 'active', 'created_at',
+        ]
+        read_only_fields = ['id', 'user', 'category_name', 'next_run', 'created_at']
+
+    def validate_category(self, value):
+        request = self.context.get('request')
+        if request and value.user_id != request.user.id:
+            raise serializers.ValidationError('Category does not belong to the current user.')
+        return value
+
+    def validate(self, attrs):
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': 'End date must not be before start date.'})
+        category = attrs.get('category', getattr(self.instance, 'category', None))
+        transaction_type = attrs.get('transaction_type', getattr(self.instance, 'transaction_type', None))
+        if category and transaction_type and category.transaction_type != transaction_type:
+            raise serializers.ValidationError({'category': 'Category type does not match the transaction type.'})
+        return attrs
+
+
+class SavingsGoalSerializer(TimedModelSerializer):
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), source='category', write_only=True)
     current_amount = serializers.SerializerMethodField()
@@ -43,6 +242,7 @@ class SavingsGoalSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SavingsGoal
+        list_serializer_class = TimedListSerializer
         fields = [
             'id',
             'user',
@@ -77,13 +277,18 @@ class SavingsGoalSerializer(serializers.ModelSerializer):
         return value
 
     def get_current_amount(self, obj):
-        total = Transaction.objects.filter(
-            user=obj.user,
-            category=obj.category,
-            transaction_type='savings',
-            date__gte=obj.start_date,
-        ).aggregate(total=Sum('amount'))['total']
-        return total or Decimal('0.00')
+        # SavingsGoalViewSet annotates saved_total; fall back to one query (memoized on the instance)
+        total = getattr(obj, 'saved_total', None)
+        if total is None:
+            total = Transaction.objects.filter(
+                user_id=obj.user_id,
+                category_id=obj.category_id,
+                transaction_type='savings',
+                date__gte=obj.start_date,
+            ).aggregate(total=Sum('amount'))['total']
+            total = total or Decimal('0.00')
+            obj.saved_total = total
+        return total
 
     def get_remaining_amount(self, obj):
         current = self.get_current_amount(obj)
@@ -98,11 +303,14 @@ class SavingsGoalSerializer(serializers.ModelSerializer):
         return percent if percent <= 100 else Decimal('100.00')
 
 
-class DebtSerializer(serializers.ModelSerializer):
+class DebtSerializer(TimedModelSerializer):
     type = serializers.CharField(source='debt_type')
+    remaining_amount = serializers.SerializerMethodField()
+    is_overdue = serializers.SerializerMethodField()
 
     class Meta:
         model = Debt
+        list_serializer_class = TimedListSerializer
         fields = [
             'id',
             'user',
@@ -115,8 +323,17 @@ class DebtSerializer(serializers.ModelSerializer):
             'notes',
             'created_at',
             'updated_at',
+            'remaining_amount',
+            'is_overdue',
         ]
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'remaining_amount', 'is_overdue']
+
+    def get_remaining_amount(self, obj):
+        remaining = obj.total_amount - obj.paid_amount
+        return str(max(remaining, Decimal('0.00')).quantize(Decimal('0.01')))
+
+    def get_is_overdue(self, obj):
+        return debt_is_overdue(obj, self.context.setdefault('today', datetime.date.today()))
 
     def validate(self, attrs):
         total_amount = attrs.get('total_amount', getattr(self.instance, 'total_amount', None))
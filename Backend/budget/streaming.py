@@ -0,0 +1,103 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+def json_array_chunks(serializer_class, context=None):
+    # Renders a chunk of rows as array items, without the surrounding brackets
+    renderer = JSONRenderer()
+
+    def render_chunk(rows):
+        data = serializer_class(rows, many=True, context=context).data
+        return renderer.render(data)[1:-1]
+
+    return render_chunk
+
+
+def stream_json_array(queryset, serializer_class, context=None, chunk_size=500):
+    """
+    Stream a queryset as a JSON array, serializing one chunk of rows at a time.
+    The output is byte-for-byte what a regular DRF list response would render,
+    but only `chunk_size` model instances are held in memory at once.
+    """
+    render_chunk = json_array_chunks(serializer_class, context)
+
+    def generate():
+        yield b'['
+        first = True
+        rows = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            rows.append(obj)
+            if len(rows) >= chunk_size:
+                yield (b'' if first else b',') + render_chunk(rows)
+                first = False
+                rows = []
+        if rows:
+            yield (b'' if first else b',') + render_chunk(rows)
+        yield b']'
+
+    return StreamingHttpResponse(generate(), content_type='application/json')
+
+
+def astream_json_array(queryset, serializer_class, context=None, chunk_size=500):
+    # stream_json_array() for async views: rows come from the async ORM, so
+    # ASGI serves the stream without a thread per chunk
+    render_chunk = json_array_chunks(serializer_class, context)
+
+    async def generate():
+        yield b'['
+        first = True
+        rows = []
+        async for obj in queryset.aiterator(chunk_size=chunk_size):
+            rows.append(obj)
+            if len(rows) >= chunk_size:
+                yield (b'' if first else b',') + render_chunk(rows)
+                first = False
+                rows = []
+        if rows:
+            yield (b'' if first else b',') + render_chunk(rows)
+        yield b']'
+
+    return StreamingHttpResponse(generate(), content_type='application/json')
+
+
+class Echo:
+    # File-like object whose write() just hands the value back, for csv.writer
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, header, filename):
+    """
+    Stream an iterable of tuples as a CSV download, one line per row.
+    """
+    writer = csv.writer(Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in row
+            ])
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def stream_ndjson(rows, fields, filename):
+    """
+    Stream an iterable of tuples as newline-delimited JSON objects keyed by `fields`.
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def generate():
+        for row in rows:
+            yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+    response = StreamingHttpResponse(generate(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,90 @@
+import datetime
+import io
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from budget.models import Category, SavingsGoal, Transaction
+
+User = get_user_model()
+
+
+class SavingsGoalListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='saver', email='saver@example.com', password='pw-12345-xyz')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.filter(user=self.user, transaction_type='savings').first()
+        Transaction.objects.create(
+            user=self.user,
+            category=self.category,
+            amount=Decimal('25.00'),
+            description='deposit',
+            date=datetime.date(2026, 1, 15),
+            transaction_type='savings',
+        )
+
+    def add_goals(self, count):
+        SavingsGoal.objects.bulk_create([
+            SavingsGoal(
+                user=self.user,
+                category=self.category,
+                title=f'Goal {i}',
+                target_amount=Decimal('1000.00'),
+                start_date=datetime.date(2026, 1, 1),
+            )
+            for i in range(count)
+        ])
+
+    def list_query_count(self):
+        # Start each measurement from the same state: data watermark row created, cache empty
+        self.client.get('/api/savings-goals/', secure=True)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/savings-goals/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def test_query_count_does_not_grow_with_goals(self):
+        self.add_goals(1)
+        single, data = self.list_query_count()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['current_amount'], Decimal('25.00'))
+
+        self.add_goals(19)
+        many, data = self.list_query_count()
+        self.assertEqual(len(data), 20)
+        self.assertEqual(single, many)
+
+
+class UserDataWatermarkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw-12345-xyz')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.filter(user=self.user, transaction_type='expense').first()
+
+    def etag(self, url):
+        return self.client.get(url, secure=True)['ETag']
+
+    def test_write_changes_etag(self):
+        before = self.etag('/api/transactions/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/transactions/', {
+                'category': self.category.id,
+                'amount': '12.00',
+                'description': 'lunch',
+                'date': '2026-01-15',
+                'transaction_type': 'expense',
+            }, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(self.etag('/api/transactions/'), before)
+
+    def test_rebuild_monthly_totals_changes_etag(self):
+        before = self.etag('/api/reports/monthly/')
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('rebuild_monthly_totals', stdout=io.StringIO())
+        self.assertNotEqual(self.etag('/api/reports/monthly/'), before)
@@ -1,6 +1,8 @@
 from rest_framework.routers import DefaultRouter
+from django.conf import settings
 from django.urls import path, include
-from .views import BudgetViewSet, CategoryViewSet, TransactionViewSet, SavingsGoalViewSet, DebtViewSet
+from .views import BudgetViewSet, CategoryViewSet, TransactionViewSet, SavingsGoalViewSet, DebtViewSet, SummaryView, MonthlyTotalsView
+from .views import RecurringTransactionViewSet
 
 router = DefaultRouter()
 router.register(r'budgets', BudgetViewSet, basename='budget')
@@ -8,8 +10,11 @@ router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'transactions', TransactionViewSet, basename='transaction')
 router.register(r'savings-goals', SavingsGoalViewSet, basename='savings-goal')
 router.register(r'debts', DebtViewSet, basename='debt')
+router.register(r'recurring-transactions', RecurringTransactionViewSet, basename='recurring-transaction')
 
 urlpatterns = [
+    path('summary/', SummaryView.as_view(), name='summary'),
+    path('reports/monthly/', MonthlyTotalsView.as_view(), name='report-monthly'),
     path('transactions/expenses/', TransactionViewSet.as_view({'get': 'expenses'}), name='transaction-expenses'),
     path('transactions/income/', TransactionViewSet.as_view({'get': 'incomes'}), name='transaction-incomes'),
     path('transactions/savings/', TransactionViewSet.as_view({'get': 'savings'}), name='transaction-savings'),
@@ -19,3 +24,29 @@ urlpatterns = [
     path('categories/savings_categories/', CategoryViewSet.as_view({'get': 'savings_categories'}), name='category-savings-categories'),
     path('', include(router.urls)),
 ]
+
+# Under ASGI the read-heavy endpoints are served by the async views; they hand
+# every other method on the same URL back to the DRF views above
+if getattr(settings, 'ASYNC_READ_VIEWS', False):
+    from . import async_views
+
+    transaction_views = TransactionViewSet.as_view({'get': 'list', 'post': 'create'})
+    category_views = CategoryViewSet.as_view({'get': 'list', 'post': 'create'})
+
+    urlpatterns = [
+        path('summary/', async_views.summary_view(SummaryView.as_view()), name='summary'),
+        path('transactions/', async_views.transaction_list_view(transaction_views), name='transaction-list'),
+        path('transactions/expenses/', async_views.transaction_list_view(
+            TransactionViewSet.as_view({'get': 'expenses'}), 'expense'), name='transaction-expenses'),
+        path('transactions/income/', async_views.transaction_list_view(
+            TransactionViewSet.as_view({'get': 'incomes'}), 'income'), name='transaction-incomes'),
+        path('transactions/savings/', async_views.transaction_list_view(
+            TransactionViewSet.as_view({'get': 'savings'}), 'savings'), name='transaction-savings'),
+        path('categories/', async_views.category_list_view(category_views), name='category-list'),
+        path('categories/expense_categories/', async_views.category_list_view(
+            CategoryViewSet.as_view({'get': 'expense_categories'}), 'expense'), name='category-expense-categories'),
+        path('categories/income_categories/', async_views.category_list_view(
+            CategoryViewSet.as_view({'get': 'income_categories'}), 'income'), name='category-income-categories'),
+        path('categories/savings_categories/', async_views.category_list_view(
+            CategoryViewSet.as_view({'get': 'savings_categories'}), 'savings'), name='category-savings-categories'),
+    ] + urlpatterns
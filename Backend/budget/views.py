@@ -1,67 +1,109 @@
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.response import Response
-from .models import Budget, Category, Transaction, SavingsGoal, Debt
+from .models import Budget, Category, Transaction, SavingsGoal, Debt, MonthlyCategoryTotal, RecurringTransaction
 from .serializers import BudgetSerializer, CategorySerializer, TransactionSerializer, SavingsGoalSerializer, DebtSerializer
+from .serializers import RecurringTransactionSerializer, TransactionListSerializer, transaction_values
+from .serializers import TransactionBulkUpdateSerializer, TransactionSelectionSerializer
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from django.db import transaction
-from django.core.cache import cache
+from django.conf import settings
+from django.http import QueryDict
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from decimal import Decimal
+import datetime
+from .cache import get_or_build, mark_user_data_changed
+from .conditional import conditional_on_user_data
+from .aggregates import budget_progress, build_debt_summary, build_summary, parse_date_range
+from .filters import filter_transactions
+from .pagination import RankedResultsPagination, TransactionCursorPagination
+from .search import search_transactions
+from .streaming import stream_csv, stream_json_array, stream_ndjson
+from .importers import PARSERS, TransactionImporter
+from . import recurring, rollups
+
+
+# Bumps the user's data watermark in the same transaction as every write
+# through the viewset, so the new version commits atomically with the change.
+# Custom write actions call mark_user_data_changed() in their own transaction
+class UserDataCacheMixin:
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().create(request, *args, **kwargs)
+            mark_user_data_changed(request.user.id)
+        return response
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().update(request, *args, **kwargs)
+            mark_user_data_changed(request.user.id)
+        return response
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().destroy(request, *args, **kwargs)
+            mark_user_data_changed(request.user.id)
+        return response
 
 
 # ViewSet for managing categories (expense, income, savings) for the authenticated user
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(UserDataCacheMixin, viewsets.ModelViewSet):
     def perform_update(self, serializer):
         with transaction.atomic():
             serializer.save(user=self.request.user)
-            # Invalidate cache when category updated
-            cache.delete(f'user_categories_{self.request.user.id}')
-            
+
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        # Cache categories for 10 minutes to reduce DB queries
-        cache_key = f'user_categories_{self.request.user.id}'
-        categories = cache.get(cache_key)
-        
-        if categories is None:
-            categories = list(Category.objects.filter(user=self.request.user))
-            cache.set(cache_key, categories, 600)  # 10 minutes
-        
-        # Return QuerySet for DRF compatibility
-        if isinstance(categories, list):
-            return Category.objects.filter(user=self.request.user)
-        return categories
+        return Category.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
         with transaction.atomic():
             serializer.save(user=self.request.user)
-            # Invalidate cache when new category created
-            cache.delete(f'user_categories_{self.request.user.id}')
+
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        # Served from the shared cache until the user's data version changes
+        data = get_or_build(
+            request.user.id,
+            'categories',
+            lambda: list(CategorySerializer(self.get_queryset(), many=True).data),
+        )
+        return Response(data)
+
+    @conditional_on_user_data
+    def list_by_type(self, request, transaction_type):
+        data = get_or_build(
+            request.user.id,
+            f'categories:{transaction_type}',
+            lambda: list(CategorySerializer(
+                Category.objects.filter(user=request.user, transaction_type=transaction_type), many=True
+            ).data),
+        )
+        return Response(data)
 
 # Action to retrieve all expense,income and savings categories for the authenticated user
     @action(detail=False, methods=['get'])
     def expense_categories(self, request):
-        qs = Category.objects.filter(user=request.user, transaction_type='expense')
-        serializer = CategorySerializer(qs, many=True)
-        return Response(serializer.data)
+        return self.list_by_type(request, 'expense')
 
     @action(detail=False, methods=['get'])
     def income_categories(self, request):
-        qs = Category.objects.filter(user=request.user, transaction_type='income')
-        serializer = CategorySerializer(qs, many=True)
-        return Response(serializer.data)
+        return self.list_by_type(request, 'income')
 
     @action(detail=False, methods=['get'])
     def savings_categories(self, request):
-        qs = Category.objects.filter(user=request.user, transaction_type='savings')
-        serializer = CategorySerializer(qs, many=True)
-        return Response(serializer.data)
+        return self.list_by_type(request, 'savings')
 
 
 # ViewSet for managing budgets for the authenticated user
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(UserDataCacheMixin, viewsets.ModelViewSet):
     def perform_update(self, serializer):
         with transaction.atomic():
             serializer.save(user=self.request.user)
@@ -71,18 +113,36 @@ class BudgetViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Budget.objects.filter(user=self.request.user)
 
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        today = datetime.date.today()
+        # Spend for the current window depends on the date, so it's part of the key
+        data = get_or_build(request.user.id, f'budgets:{today}', lambda: self.build_list(today))
+        return Response(data)
+
+    def build_list(self, today):
+        budgets = list(self.get_queryset().select_related('category'))
+        context = self.get_serializer_context()
+        context['budget_progress'] = budget_progress(self.request.user, budgets, today)
+        return list(BudgetSerializer(budgets, many=True, context=context).data)
+
     def perform_create(self, serializer):
         with transaction.atomic():
             serializer.save(user=self.request.user)
 
 
 # ViewSet for managing transactions (expenses, incomes, savings) for the authenticated user
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(UserDataCacheMixin, viewsets.ModelViewSet):
     def perform_update(self, serializer):
         with transaction.atomic():
-            serializer.save(user=self.request.user)
+            old_key = rollups.rollup_key(serializer.instance)
+            old_amount = serializer.instance.amount
+            instance = serializer.save(user=self.request.user)
+            rollups.record_updated(old_key, old_amount, instance)
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TransactionCursorPagination
+    stream_chunk_size = 500
 
     def get_queryset(self):
         # Use select_related to avoid N+1 queries
@@ -90,49 +150,200 @@ class TransactionViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         with transaction.atomic():
-            serializer.save(user=self.request.user)
+            instance = serializer.save(user=self.request.user)
+            rollups.record_created(instance)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            rollups.record_deleted(instance)
+            instance.delete()
+
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        # One query for any mix of types, dates, categories and amounts; see filters.py
+        return self.list_transactions(filter_transactions(self.get_queryset(), request.query_params))
+
+    def list_transactions(self, qs):
+        # Keyset page when 'cursor'/'page_size' is given, otherwise the full
+        # list as a streamed array, so memory stays bounded however long the
+        # ledger is. Lists are read-only, so they skip model instances and read values() rows
+        rows = transaction_values(qs)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(TransactionListSerializer(page, many=True).data)
+
+        return stream_json_array(
+            rows.order_by('-date', '-id'),
+            TransactionListSerializer,
+            chunk_size=self.stream_chunk_size,
+        )
+
+    @conditional_on_user_data
+    def list_by_type(self, request, transaction_type):
+        qs = self.get_queryset().filter(transaction_type=transaction_type)
+        return self.list_transactions(filter_transactions(qs, request.query_params))
 
 # Actions to retrieve transactions by type (expenses, incomes, savings) with date filtering
     @action(detail=False, methods=['get'])
     def expenses(self, request):
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        # get_queryset() already has select_related
-        qs = self.get_queryset().filter(transaction_type='expense')
-        if start_date and end_date:
-            qs = qs.filter(date__range=[start_date, end_date])
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        return self.list_by_type(request, 'expense')
 
     @action(detail=False, methods=['get'])
     def incomes(self, request):
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        # get_queryset() already has select_related
-        qs = self.get_queryset().filter(transaction_type='income')
-        if start_date and end_date:
-            qs = qs.filter(date__range=[start_date, end_date])
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        return self.list_by_type(request, 'income')
 
     @action(detail=False, methods=['get'])
     def savings(self, request):
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        # get_queryset() already has select_related
-        qs = self.get_queryset().filter(transaction_type='savings')
-        if start_date and end_date:
-            qs = qs.filter(date__range=[start_date, end_date])
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        return self.list_by_type(request, 'savings')
+
+    # Ranked full-text search over descriptions; combines with the list filters
+    @action(detail=False, methods=['get'])
+    @conditional_on_user_data
+    def search(self, request):
+        qs = filter_transactions(self.get_queryset(), request.query_params)
+        rows = transaction_values(search_transactions(qs, request.query_params.get('q')))
+        paginator = RankedResultsPagination()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        return paginator.get_paginated_response(TransactionListSerializer(page, many=True).data)
+
+    # Streamed CSV / NDJSON export of the user's ledger, read straight from values_list()
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in ('csv', 'ndjson'):
+            return Response({'export_format': 'Use "csv" or "ndjson".'}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = filter_transactions(Transaction.objects.filter(user=request.user), request.query_params)
+
+        fields = ['id', 'date', 'transaction_type', 'category', 'amount', 'description', 'created_at']
+        rows = qs.order_by('-date', '-id').values_list(
+            'id', 'date', 'transaction_type', 'category__name', 'amount', 'description', 'created_at'
+        ).iterator(chunk_size=self.stream_chunk_size)
+
+        if export_format == 'ndjson':
+            return stream_ndjson(rows, fields, 'transactions.ndjson')
+        return stream_csv(rows, fields, 'transactions.csv')
+
+    # Bulk import of a CSV or OFX bank export, written in bulk_create batches
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_file(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': 'No file was submitted.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = (request.data.get('format') or upload.name.rsplit('.', 1)[-1]).lower()
+        if file_format not in PARSERS:
+            return Response(
+                {'format': f'Unsupported format. Use one of: {", ".join(sorted(PARSERS))}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        default_batch_size = getattr(settings, 'TRANSACTION_IMPORT_BATCH_SIZE', 500)
+        try:
+            batch_size = int(request.data.get('batch_size') or default_batch_size)
+        except (TypeError, ValueError):
+            return Response({'batch_size': 'A valid integer is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        batch_size = max(1, min(batch_size, 5000))
+
+        importer = TransactionImporter(request.user, batch_size=batch_size)
+        result = importer.run(PARSERS[file_format](upload))
+        if result['created'] and 'file' not in result:
+            response_status = status.HTTP_201_CREATED
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+    def bulk_queryset(self, selection):
+        """
+        Lock the transactions picked by a TransactionSelectionSerializer and
+        return them as an id-based queryset, so rollup deltas read after an
+        update see the same rows even when the update moves them out of the filter.
+        """
+        qs = Transaction.objects.filter(user=self.request.user)
+        if 'ids' in selection:
+            qs = qs.filter(id__in=selection['ids'])
+        elif 'filter' in selection:
+            params = QueryDict(mutable=True)
+            for key, value in selection['filter'].items():
+                params.setlist(key, [str(item) for item in (value if isinstance(value, list) else [value])])
+            qs = filter_transactions(qs, params)
+
+        max_rows = getattr(settings, 'TRANSACTION_BULK_MAX_ROWS', 5000)
+        ids = list(qs.order_by().select_for_update().values_list('id', flat=True)[:max_rows + 1])
+        if len(ids) > max_rows:
+            raise ValidationError({'filter': f'Selects more than {max_rows} transactions; narrow it down.'})
+        return Transaction.objects.filter(id__in=ids)
 
+    def check_category_types(self, qs, changes):
+        # Every row must end up with a category of its own transaction type
+        if 'category' in changes and 'transaction_type' not in changes:
+            if qs.exclude(transaction_type=changes['category'].transaction_type).exists():
+                raise ValidationError({'category': 'Category type does not match the type of every selected transaction.'})
+        elif 'transaction_type' in changes and 'category' not in changes:
+            if qs.exclude(category__transaction_type=changes['transaction_type']).exists():
+                raise ValidationError({
+                    'transaction_type': 'Some selected transactions have a category of another type; send "category" too.',
+                })
 
-class SavingsGoalViewSet(viewsets.ModelViewSet):
+    # Bulk re-categorize / re-type with a single UPDATE. Rollups are adjusted
+    # and the data version bumped once for the whole batch
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        serializer = TransactionBulkUpdateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        changes = {
+            field: serializer.validated_data[field]
+            for field in ('category', 'transaction_type')
+            if field in serializer.validated_data
+        }
+        with transaction.atomic():
+            qs = self.bulk_queryset(serializer.validated_data)
+            self.check_category_types(qs, changes)
+            removed = rollups.deltas_for_queryset(qs, sign=-1)
+            updated = qs.update(**changes)
+            rollups.apply_deltas(rollups.combine_deltas(removed, rollups.deltas_for_queryset(qs)))
+            mark_user_data_changed(request.user.id)
+        return Response({'updated': updated})
+
+    # Bulk delete with a single DELETE; same batching of rollups and caches as bulk_update
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        serializer = TransactionSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            qs = self.bulk_queryset(serializer.validated_data)
+            removed = rollups.deltas_for_queryset(qs, sign=-1)
+            deleted, _ = qs.delete()
+            rollups.apply_deltas(removed)
+            mark_user_data_changed(request.user.id)
+        return Response({'deleted': deleted})
+
+
+class SavingsGoalViewSet(UserDataCacheMixin, viewsets.ModelViewSet):
     serializer_class = SavingsGoalSerializer
     permission_classes = [IsAuthenticated]
 
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_queryset(self):
-        return SavingsGoal.objects.filter(user=self.request.user).select_related('category')
+        # Sum each goal's savings in a correlated subquery so listing goals costs one query
+        saved = Transaction.objects.filter(
+            user=OuterRef('user'),
+            category=OuterRef('category'),
+            transaction_type='savings',
+            date__gte=OuterRef('start_date'),
+        ).order_by().values('category').annotate(total=Sum('amount')).values('total')
+        return (
+            SavingsGoal.objects.filter(user=self.request.user)
+            .select_related('category')
+            .annotate(saved_total=Coalesce(
+                Subquery(saved, output_field=DecimalField(max_digits=12, decimal_places=2)),
+                Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ))
+        )
 
     def perform_create(self, serializer):
         with transaction.atomic():
@@ -140,15 +351,33 @@ class SavingsGoalViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         with transaction.atomic():
-            serializer.save(user=self.request.user)
+            instance = serializer.save(user=self.request.user)
+            # The annotated total may be stale if category or start_date changed
+            instance.saved_total = None
 
 
-class DebtViewSet(viewsets.ModelViewSet):
+class DebtViewSet(UserDataCacheMixin, viewsets.ModelViewSet):
     serializer_class = DebtSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Debt.objects.filter(user=self.request.user)
+        qs = Debt.objects.filter(user=self.request.user)
+        if self.action == 'list' and self.request.query_params.get('overdue') in ('1', 'true', 'True'):
+            # Served by the (user, due_date) index
+            qs = qs.filter(due_date__lt=datetime.date.today(), paid_amount__lt=F('total_amount'))
+        return qs
+
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    # Header totals per debt type and overdue counts without downloading every debt
+    @action(detail=False, methods=['get'])
+    @conditional_on_user_data
+    def summary(self, request):
+        today = datetime.date.today()
+        data = get_or_build(request.user.id, f'debts:summary:{today}', lambda: build_debt_summary(request.user, today))
+        return Response(data)
 
     def perform_create(self, serializer):
         with transaction.atomic():
@@ -156,4 +385,79 @@ class DebtViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         with transaction.atomic():
-            serializer.save(user=self.request.user)
\ No newline at end of file
+            serializer.save(user=self.request.user)
+
+
+# ViewSet for recurring transaction rules; occurrences are created by materialize_recurring
+class RecurringTransactionViewSet(UserDataCacheMixin, viewsets.ModelViewSet):
+    serializer_class = RecurringTransactionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return RecurringTransaction.objects.filter(user=self.request.user).select_related('category')
+
+    @conditional_on_user_data
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            start_date = serializer.validated_data['start_date']
+            serializer.save(user=self.request.user, next_run=start_date)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            old_next_run = serializer.instance.next_run
+            rule = serializer.save(user=self.request.user)
+            # Re-align with a changed start date or cadence, never repeating an occurrence already created
+            rule.next_run = recurring.first_occurrence_on_or_after(rule, max(old_next_run, rule.start_date))
+            rule.save(update_fields=['next_run'])
+
+
+# Aggregated dashboard totals, per-category breakdown and budget-vs-actual for a date range
+class SummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @conditional_on_user_data
+    def get(self, request):
+        start_date, end_date = parse_date_range(request.query_params)
+        today = datetime.date.today()
+        # Budget windows are picked by date, so the day is part of the key
+        data = get_or_build(
+            request.user.id,
+            f'summary:{start_date}:{end_date}:{today}',
+            lambda: build_summary(request.user, start_date, end_date, today),
+        )
+        return Response(data)
+
+
+# Monthly per-category totals read from the MonthlyCategoryTotal rollup table
+class MonthlyTotalsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @conditional_on_user_data
+    def get(self, request):
+        start_date, end_date = parse_date_range(request.query_params)
+        qs = MonthlyCategoryTotal.objects.filter(user=request.user)
+        if start_date:
+            qs = qs.filter(month__gte=start_date.replace(day=1))
+        if end_date:
+            qs = qs.filter(month__lte=end_date)
+        transaction_type = request.query_params.get('type')
+        if transaction_type:
+            qs = qs.filter(transaction_type=transaction_type)
+
+        rows = qs.order_by('month', 'transaction_type', 'category__name').values(
+            'month', 'category_id', 'category__name', 'transaction_type', 'total', 'count'
+        )
+        return Response([
+            {
+                'month': row['month'],
+                'category_id': row['category_id'],
+                'category_name': row['category__name'],
+                'transaction_type': row['transaction_type'],
+                'total': str(row['total']),
+                'count': row['count'],
+            }
+            for row in rows
+        ])
@@ -6,6 +6,7 @@ python3.9 -m pip install -r requirements.txt
 echo "Make Migration..."
 python3.9 manage.py makemigrations --noinput
 python3.9 manage.py migrate --noinput
+python3.9 manage.py createcachetable
 python3.9 manage.py seed_categories
 echo "Collect Static..."
 python3.9 manage.py collectstatic --noinput --clear
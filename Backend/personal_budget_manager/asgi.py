@@ -0,0 +1,13 @@
+import os
+from django.core.asgi import get_asgi_application
+
+if os.environ.get('VERCEL'):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personal_budget_manager.settings_production')
+else:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personal_budget_manager.settings')
+
+# Read endpoints run as async views under one event loop (see budget/async_views.py)
+os.environ.setdefault('ASYNC_READ_VIEWS', 'true')
+
+application = get_asgi_application()
+app = application
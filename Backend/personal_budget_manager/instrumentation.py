@@ -0,0 +1,74 @@
+"""
+Per-request timers behind RequestInstrumentationMiddleware. Standard library
+only, so apps can report into them without importing the middleware.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# The QueryTimer of the request being handled. A context variable follows the
+# request into the threads sync_to_async runs ORM calls in under ASGI, where
+# an execute_wrapper entered on the middleware's own thread would miss them
+current_query_timer = ContextVar('current_query_timer', default=None)
+current_serialize_timer = ContextVar('current_serialize_timer', default=None)
+
+
+class QueryTimer:
+    """
+    execute_wrapper hook counting queries and the time spent in the database driver.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def time_query(execute, sql, params, many, context):
+    timer = current_query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(connection):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def on_connection_created(sender, connection, **kwargs):
+    install_query_timer(connection)
+
+
+class SerializeTimer:
+    """
+    Time spent producing serializer output during a request, as reported by
+    code running inside timed_serialization().
+    """
+
+    def __init__(self):
+        self.duration = 0.0
+        self.active = False
+
+
+@contextmanager
+def timed_serialization():
+    # Counts only the outermost .data; nested serializers are part of it
+    timer = current_serialize_timer.get()
+    if timer is None or timer.active:
+        yield
+        return
+    timer.active = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.duration += time.perf_counter() - start
+        timer.active = False
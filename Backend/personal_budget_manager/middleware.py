@@ -0,0 +1,198 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+from inspect import isawaitable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .instrumentation import (
+    QueryTimer, SerializeTimer, current_query_timer, current_serialize_timer, install_query_timer,
+    on_connection_created,
+)
+
+logger = logging.getLogger('personal_budget_manager.requests')
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Records SQL count/time, view time, serializer time (code inside
+    instrumentation.timed_serialization, including queries it triggers) and
+    response render time (encoding the serialized data) for each request,
+    reports them in a Server-Timing header and a structured log line, and can write a cProfile dump for sampled or
+    explicitly requested requests. View time excludes serializer time.
+
+    Enabled with REQUEST_INSTRUMENTATION; profiling additionally needs
+    REQUEST_PROFILING plus a sample rate or the X-Profile-Token header.
+
+    Runs natively under WSGI and ASGI, so it adds no thread hop in front of the
+    async views. Under ASGI a profile covers only the event loop thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django runs sync hooks through a thread under ASGI; use the async ones
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+        connection_created.connect(on_connection_created)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(state)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(state)
+        return self.finish(request, response, state)
+
+    def start(self, request):
+        timer = QueryTimer()
+        serialize_timer = SerializeTimer()
+        request._instrumentation = {}
+        profiler = self.start_profiler(request)
+        tokens = current_query_timer.set(timer), current_serialize_timer.set(serialize_timer)
+        return timer, serialize_timer, tokens, profiler, time.perf_counter()
+
+    def stop(self, state):
+        _, _, (query_token, serialize_token), profiler, _ = state
+        current_query_timer.reset(query_token)
+        current_serialize_timer.reset(serialize_token)
+        if profiler is not None:
+            profiler.disable()
+
+    def finish(self, request, response, state):
+        timer, serialize_timer, _, profiler, start = state
+        marks = request._instrumentation
+        total = time.perf_counter() - start
+
+        view_start = marks.get('view_start', start)
+        view_end = marks.get('view_end', start + total)
+        render_end = marks.get('render_end', view_end)
+        timings = {
+            'db': timer.duration,
+            'view': max(view_end - view_start - serialize_timer.duration, 0.0),
+            'serialize': serialize_timer.duration,
+            'render': render_end - view_end,
+            'total': total,
+        }
+
+        response['Server-Timing'] = ', '.join(
+            [f'db;dur={timings["db"] * 1000:.1f};desc="{timer.count} queries"']
+            + [f'{name};dur={timings[name] * 1000:.1f}' for name in ('view', 'serialize', 'render', 'total')]
+        )
+        logger.info(
+            'request method=%s path=%s status=%s queries=%d db_ms=%.1f view_ms=%.1f serialize_ms=%.1f '
+            'render_ms=%.1f total_ms=%.1f',
+            request.method, request.path, response.status_code, timer.count,
+            timings['db'] * 1000, timings['view'] * 1000, timings['serialize'] * 1000,
+            timings['render'] * 1000, total * 1000,
+            extra={
+                'http_method': request.method,
+                'http_path': request.path,
+                'http_status': response.status_code,
+                'db_queries': timer.count,
+                'timings_ms': {name: round(value * 1000, 3) for name, value in timings.items()},
+            },
+        )
+
+        if profiler is not None:
+            self.dump_profile(profiler, request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation['view_start'] = time.perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation['view_start'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that separately
+        marks = request._instrumentation
+        marks['view_end'] = time.perf_counter()
+
+        def rendered(response):
+            marks['render_end'] = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return RequestInstrumentationMiddleware.process_template_response(self, request, response)
+
+    def start_profiler(self, request):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            return None
+
+        token = getattr(settings, 'REQUEST_PROFILE_TOKEN', '')
+        requested = bool(token) and request.headers.get('X-Profile-Token') == token
+        sampled = random.random() < getattr(settings, 'REQUEST_PROFILE_SAMPLE_RATE', 0.0)
+        if not (requested or sampled):
+            return None
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return None
+        return profiler
+
+    def dump_profile(self, profiler, request):
+        directory = getattr(settings, 'REQUEST_PROFILE_DIR', '/tmp/request-profiles')
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+        path = os.path.join(directory, f'{int(time.time() * 1000)}-{request.method}-{slug}.prof')
+        profiler.dump_stats(path)
+        logger.info('profile written path=%s', path, extra={'profile_path': path})
+
+
+@sync_and_async_middleware
+def static_files_middleware(get_response):
+    """
+    Stock WhiteNoiseMiddleware, also usable natively under ASGI.
+
+    WhiteNoise is sync-only, so under ASGI Django would run every request, not
+    just static files, through a thread to call it. Under WSGI this returns
+    WhiteNoise itself. Under ASGI it calls WhiteNoise as usual: a static file
+    comes back as a response, and anything else as the awaitable from the
+    rest of the chain, which is awaited here.
+    """
+    whitenoise = WhiteNoiseMiddleware(get_response)
+    if not iscoroutinefunction(get_response):
+        return whitenoise
+
+    async def middleware(request):
+        response = whitenoise(request)
+        if isawaitable(response):
+            response = await response
+        return response
+
+    return middleware
@@ -7,6 +7,8 @@ from pathlib import Path
 from datetime import timedelta
 
 import dj_database_url
+import django
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -58,11 +60,10 @@ EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 REST_FRAMEWORK = {
+    # The frontend only sends Bearer JWTs; session, basic and token auth cost a
+    # session read, a password hash or a token query on every request and are unused
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -99,13 +100,16 @@ DJOSER = {
         'user_create': 'accounts.serializers.UserCreateSerializer',
         'user': 'accounts.serializers.UserCreateSerializer',
         'current_user': 'accounts.serializers.CustomUserSerializer',
+        'password_reset': 'accounts.serializers.EmailLookupResetSerializer',
+        'username_reset': 'accounts.serializers.EmailLookupResetSerializer',
     },
 }
 
 MIDDLEWARE = [
+    'personal_budget_manager.middleware.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'personal_budget_manager.middleware.static_files_middleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -115,6 +119,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request SQL/view/render timings as Server-Timing headers and log lines
+REQUEST_INSTRUMENTATION = os.environ.get('REQUEST_INSTRUMENTATION', 'False').lower() == 'true'
+# cProfile dumps for sampled requests, or any request sending X-Profile-Token
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING', 'False').lower() == 'true'
+REQUEST_PROFILE_SAMPLE_RATE = float(os.environ.get('REQUEST_PROFILE_SAMPLE_RATE', '0'))
+REQUEST_PROFILE_TOKEN = os.environ.get('REQUEST_PROFILE_TOKEN', '')
+REQUEST_PROFILE_DIR = os.environ.get('REQUEST_PROFILE_DIR', '/tmp/request-profiles')
+
 ROOT_URLCONF = 'personal_budget_manager.urls'
 
 TEMPLATES = [
@@ -133,14 +145,66 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'personal_budget_manager.wsgi.application'
+ASGI_APPLICATION = 'personal_budget_manager.asgi.application'
+
+# Serve summary, category and transaction lists from the async views in
+# budget/async_views.py. asgi.py turns this on; under WSGI the DRF views are
+# faster, since every async view would need its own event loop
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', 'False').lower() == 'true'
 
 # Database configuration for PostgreSQL (Vercel)
-DATABASES = {
-    'default': dj_database_url.config(
-        conn_max_age=0,  # No persistent connections - perfect for serverless/Neon
-        conn_health_checks=True,  # Ensure connections are healthy
+# Connection handling, selectable with DB_CONNECTION_MODE:
+#   'serverless' (default) - new connection per request; safe when workers are frozen between invocations
+#   'persistent'           - reuse the connection in a warm worker, health-checked before each request
+#                            and recycled after DB_CONN_MAX_AGE seconds
+#   'pool'                 - Django's native psycopg 3 pool; needs Django 5.1+ and
+#                            `pip install "psycopg[binary,pool]"`. Not available on the python3.9
+#                            runtime pinned in vercel.json, which caps Django at 4.2
+DB_CONNECTION_MODE = os.environ.get('DB_CONNECTION_MODE', 'serverless')
+
+if DB_CONNECTION_MODE == 'persistent':
+    DATABASES = {
+        'default': dj_database_url.config(
+            conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '300')),
+            conn_health_checks=True,
+        )
+    }
+elif DB_CONNECTION_MODE == 'pool':
+    if django.VERSION < (5, 1):
+        raise ImproperlyConfigured(
+            f'DB_CONNECTION_MODE=pool requires Django 5.1 or later (running {django.get_version()})'
+        )
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError as exc:
+        raise ImproperlyConfigured(
+            'DB_CONNECTION_MODE=pool requires psycopg 3 with the pool extra: pip install "psycopg[binary,pool]"'
+        ) from exc
+
+    DATABASES = {
+        'default': dj_database_url.config(
+            conn_max_age=0,  # The pool owns connection lifetime; Django rejects both together
+        )
+    }
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '1')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800')),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        'check': ConnectionPool.check_connection,  # Health check on checkout
+    }
+elif DB_CONNECTION_MODE == 'serverless':
+    DATABASES = {
+        'default': dj_database_url.config(
+            conn_max_age=0,  # No persistent connections - perfect for serverless/Neon
+            conn_health_checks=True,  # Ensure connections are healthy
+        )
+    }
+else:
+    raise ImproperlyConfigured(
+        f"Unknown DB_CONNECTION_MODE {DB_CONNECTION_MODE!r}; use 'serverless', 'persistent' or 'pool'"
     )
-}
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -164,17 +228,59 @@ TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
-# Add caching to reduce database queries
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,  # 5 minutes
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000
+# Shared cache backend, selectable with CACHE_BACKEND:
+#   'database' (default) - table in the main database, shared by every serverless worker
+#   'file'               - files under CACHE_LOCATION, shared by processes on one host
+#   'locmem'             - per-process memory, for local development only
+# Per-user entries are versioned by budget.cache, so any backend stays consistent.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'database')
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', '/tmp/budget_cache'),
+            'TIMEOUT': 300,  # 5 minutes
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000
+            }
         }
     }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 300,  # 5 minutes
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000
+            }
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'budget_cache'),
+            'TIMEOUT': 300,  # 5 minutes
+            'OPTIONS': {
+                'MAX_ENTRIES': 50000
+            }
+        }
+    }
+
+# Per-process cache for users authenticated by CachedJWTAuthentication.
+# Kept local and short-lived so a hit costs no query at all
+CACHES['auth'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'jwt-users',
+    'TIMEOUT': 60,
+    'OPTIONS': {
+        'MAX_ENTRIES': 5000
+    }
 }
+JWT_USER_CACHE_ALIAS = 'auth'
+JWT_USER_CACHE_TIMEOUT = int(os.environ.get('JWT_USER_CACHE_TIMEOUT', '60'))  # 0 disables the cache
 
 # CORS settings for production
 CORS_ALLOWED_ORIGINS = [
@@ -232,6 +338,13 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'INFO',
     },
+    'loggers': {
+        'personal_budget_manager.requests': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
 # Djoser / Email Settings
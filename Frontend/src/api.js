@@ -45,6 +45,11 @@ apiClient.interceptors.request.use(
 // Transaction API
 export const transactionAPI = {
   getAll: () => apiClient.get('transactions/'),
+  // Combined filters in one request: types ('expense,income'), start_date, end_date,
+  // categories (comma-separated ids), min_amount, max_amount
+  filter: (params) => apiClient.get('transactions/', { params }),
+  // Ranked description search; accepts the same filters plus page_size/offset
+  search: (q, params) => apiClient.get('transactions/search/', { params: { ...params, q } }),
   getExpenses: (startDate, endDate) => apiClient.get('transactions/expenses/', {
     params: { start_date: startDate, end_date: endDate }
   }),
@@ -57,6 +62,22 @@ export const transactionAPI = {
   create: (transactionData) => apiClient.post('transactions/', transactionData),
   update: (id, transactionData) => apiClient.put(`transactions/${id}/`, transactionData),
   delete: (id) => apiClient.delete(`transactions/${id}/`),
+  // Bulk actions take { ids: [...] }, { filter: { ...same keys as filter() } } or { all: true };
+  // bulkUpdate also takes category and/or transaction_type to set
+  bulkUpdate: (selection, changes) => apiClient.post('transactions/bulk-update/', { ...selection, ...changes }),
+  bulkDelete: (selection) => apiClient.post('transactions/bulk-delete/', selection),
+  importFile: (file, format) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    if (format) {
+      formData.append('format', format);
+    }
+    return apiClient.post('transactions/import/', formData);
+  },
+  export: (params) => apiClient.get('transactions/export/', {
+    params,
+    responseType: 'blob'
+  }),
 };
 
 // Category API
@@ -87,11 +108,24 @@ export const savingsGoalAPI = {
 
 export const debtAPI = {
   getAll: () => apiClient.get('debts/'),
+  getSummary: () => apiClient.get('debts/summary/'),
   create: (debtData) => apiClient.post('debts/', debtData),
   update: (id, debtData) => apiClient.put(`debts/${id}/`, debtData),
   delete: (id) => apiClient.delete(`debts/${id}/`),
 };
 
+export const summaryAPI = {
+  get: (startDate, endDate) => apiClient.get('summary/', {
+    params: { start_date: startDate, end_date: endDate }
+  }),
+};
+
+export const reportAPI = {
+  getMonthly: (startDate, endDate, type) => apiClient.get('reports/monthly/', {
+    params: { start_date: startDate, end_date: endDate, type }
+  }),
+};
+
 //  currency list
 export const currencyList = [
   { code: 'USD', symbol: '$', name: 'US Dollar' },
@@ -171,6 +205,8 @@ const api = {
   budget: budgetAPI,
   savingsGoal: savingsGoalAPI,
   debt: debtAPI,
+  summary: summaryAPI,
+  report: reportAPI,
 };
 
 export default api;
\ No newline at end of file
@@ -9,13 +9,12 @@ import CloseIcon from '@mui/icons-material/Close';
 import AddIcon from '@mui/icons-material/Add';
 import SavingsIcon from '@mui/icons-material/Savings';
 import CalendarTodayIcon from '@mui/icons-material/CalendarToday';
-import { categoryAPI, budgetAPI, transactionAPI, getCurrencySymbol } from '../api';
+import { categoryAPI, budgetAPI, getCurrencySymbol } from '../api';
 
 function BudgetsPage() {
     const theme = useTheme();
     const [budgets, setBudgets] = useState([]);
     const [categories, setCategories] = useState([]);
-    const [transactions, setTransactions] = useState([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [isAddBudgetDialogOpen, setIsAddBudgetDialogOpen] = useState(false);
@@ -28,27 +27,26 @@ function BudgetsPage() {
     const [editingBudget, setEditingBudget] = useState(null);
 
     useEffect(() => {
-        fetchBudgetsCategoriesTransactions();
+        fetchBudgetsAndCategories();
         const updateCurrency = () => setCurrencySymbol(getCurrencySymbol());
         window.addEventListener('currencyChange', updateCurrency);
         return () => window.removeEventListener('currencyChange', updateCurrency);
     }, []);
 
-    const fetchBudgetsCategoriesTransactions = async () => {
+    const fetchBudgetsAndCategories = async () => {
         try {
             setLoading(true);
-            const [budgetsRes, categoriesRes, transactionsRes] = await Promise.all([
+            // Spend for each budget's current period is computed by the API
+            const [budgetsRes, categoriesRes] = await Promise.all([
                 budgetAPI.getAll(),
-                categoryAPI.getExpenseCategories(),
-                transactionAPI.getExpenses()
+                categoryAPI.getExpenseCategories()
             ]);
             setBudgets(budgetsRes.data);
             setCategories(categoriesRes.data);
-            setTransactions(transactionsRes.data);
             setLoading(false);
         } catch (err) {
-            console.error('Error fetching budgets, categories, or transactions:', err);
-            setError('Failed to load budgets, categories, or transactions');
+            console.error('Error fetching budgets or categories:', err);
+            setError('Failed to load budgets or categories');
             setLoading(false);
         }
     };
@@ -124,79 +122,6 @@ function BudgetsPage() {
         setSnackbar({ ...snackbar, open: false });
     };
 
-    const addMonthsClamped = (date, months) => {
-        const base = new Date(date);
-        const day = base.getDate();
-        base.setDate(1);
-        base.setMonth(base.getMonth() + months);
-        const lastDay = new Date(base.getFullYear(), base.getMonth() + 1, 0).getDate();
-        base.setDate(Math.min(day, lastDay));
-        return base;
-    };
-
-    const addYearsClamped = (date, years) => {
-        const base = new Date(date);
-        const day = base.getDate();
-        base.setDate(1);
-        base.setFullYear(base.getFullYear() + years);
-        const lastDay = new Date(base.getFullYear(), base.getMonth() + 1, 0).getDate();
-        base.setDate(Math.min(day, lastDay));
-        return base;
-    };
-
-    const getNextPeriodDate = (date, period) => {
-        if (period === 'weekly') {
-            const next = new Date(date);
-            next.setDate(next.getDate() + 7);
-            return next;
-        }
-        if (period === 'yearly') {
-            return addYearsClamped(date, 1);
-        }
-        return addMonthsClamped(date, 1);
-    };
-
-    const getActivePeriodRange = (budget) => {
-        const start = new Date(budget.start_date);
-        if (Number.isNaN(start.getTime())) {
-            return null;
-        }
-
-        const now = new Date();
-        let periodStart = new Date(start);
-        let periodEnd = getNextPeriodDate(periodStart, budget.period);
-        let guard = 0;
-
-        while (periodEnd <= now && guard < 600) {
-            periodStart = periodEnd;
-            periodEnd = getNextPeriodDate(periodStart, budget.period);
-            guard += 1;
-        }
-
-        return { periodStart, periodEnd };
-    };
-
-    // Helper to calculate spent for a budget
-    const calculateSpent = (budget) => {
-        const activeRange = getActivePeriodRange(budget);
-        if (!activeRange) {
-            return 0;
-        }
-
-        const { periodStart, periodEnd } = activeRange;
-        return transactions
-            .filter(txn => {
-                const txnCatId = Number(typeof txn.category === 'object' ? txn.category.id : txn.category);
-                const budgetCatId = Number(typeof budget.category === 'object' ? budget.category.id : budget.category);
-                return (
-                    txnCatId === budgetCatId &&
-                    new Date(txn.date) >= periodStart &&
-                    new Date(txn.date) < periodEnd
-                );
-            })
-            .reduce((sum, txn) => sum + parseFloat(txn.amount), 0);
-    };
-
     if (loading) {
         return (
             <Box display="flex" justifyContent="center" alignItems="center" height="100vh">
@@ -256,7 +181,7 @@ function BudgetsPage() {
 
             <Grid container spacing={3} alignItems="flex-start">
                 {budgets.map((budget) => {
-                    const spent = calculateSpent(budget);
+                    const spent = Number(budget.spent) || 0;
                     const remaining = Number(budget.amount) - spent;
                     const percent = Number(budget.amount) ? Math.min((spent / Number(budget.amount)) * 100, 100) : 0;
                     const categoryName =
@@ -320,7 +245,7 @@ function BudgetsPage() {
                 onClose={handleAddBudgetClose}
                 onAddBudget={handleAddNewBudget}
                 categories={categories}
-                onAddCustomCategory={fetchBudgetsCategoriesTransactions}
+                onAddCustomCategory={fetchBudgetsAndCategories}
                 editingBudget={editingBudget}
             />
 
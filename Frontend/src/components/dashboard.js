@@ -270,21 +270,24 @@ const Dashboard = () => {
       const formattedStartDate = formatDateForApi(startDate);
       const formattedEndDate = formatDateForApi(endDate);
 
-      const [expensesRes, incomesRes, savingsRes, budgetsRes, categoriesRes, savingsGoalsRes] = await Promise.all([
-        transactionAPI.getExpenses(formattedStartDate, formattedEndDate),
-        transactionAPI.getIncomes(formattedStartDate, formattedEndDate),
-        transactionAPI.getSavings(formattedStartDate, formattedEndDate),
+      const [transactionsRes, budgetsRes, categoriesRes, savingsGoalsRes] = await Promise.all([
+        transactionAPI.filter({
+          types: 'expense,income,savings',
+          start_date: formattedStartDate,
+          end_date: formattedEndDate
+        }),
         budgetAPI.getAll(),
         categoryAPI.getExpenseCategories(),
         savingsGoalAPI.getAll()
       ]);
 
-      const expenses = expensesRes.data;
-      const incomes = incomesRes.data;
-      const savingsTxns = savingsRes.data;
+      // Already newest first
+      const allTransactions = transactionsRes.data;
+      const expenses = allTransactions.filter(t => t.transaction_type === 'expense');
+      const incomes = allTransactions.filter(t => t.transaction_type === 'income');
+      const savingsTxns = allTransactions.filter(t => t.transaction_type === 'savings');
       const budgets = budgetsRes.data;
       const savingsGoals = savingsGoalsRes.data;
-      const allTransactions = [...expenses, ...incomes, ...savingsTxns].sort((a, b) => new Date(b.date) - new Date(a.date));
       setTransactions(allTransactions);
       setCategories(categoriesRes.data);
 
@@ -1,4 +1,4 @@
-import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import {
 	Alert,
 	Box,
@@ -76,6 +76,7 @@ function DebtPage() {
 	const theme = useTheme();
 	const isMobile = useMediaQuery(theme.breakpoints.down('md'));
 	const [debts, setDebts] = useState([]);
+	const [summary, setSummary] = useState({ iOwe: 0, owedToMe: 0, overdueCount: 0 });
 	const [loading, setLoading] = useState(true);
 	const [currencySymbol, setCurrencySymbol] = useState(getCurrencySymbol());
 	const [dialogOpen, setDialogOpen] = useState(false);
@@ -134,23 +135,24 @@ function DebtPage() {
 		return () => window.removeEventListener('currencyChange', updateCurrency);
 	}, []);
 
-	const summary = useMemo(() => {
-		return debts.reduce(
-			(acc, debt) => {
-				const remaining = Math.max(Number(debt.totalAmount) - Number(debt.paidAmount), 0);
-				if (debt.type === 'i_owe') {
-					acc.iOwe += remaining;
-				} else {
-					acc.owedToMe += remaining;
-				}
-				if (getStatus(debt) === 'overdue') {
-					acc.overdueCount += 1;
-				}
-				return acc;
-			},
-			{ iOwe: 0, owedToMe: 0, overdueCount: 0 }
-		);
-	}, [debts]);
+	// Header totals are aggregated on the server
+	const fetchSummary = useCallback(async () => {
+		try {
+			const response = await debtAPI.getSummary();
+			const { types, overdue_count: overdueCount } = response.data;
+			setSummary({
+				iOwe: Number(types.i_owe.outstanding),
+				owedToMe: Number(types.owed_to_me.outstanding),
+				overdueCount,
+			});
+		} catch (error) {
+			console.error('Failed to fetch debt summary:', error);
+		}
+	}, []);
+
+	useEffect(() => {
+		fetchSummary();
+	}, [fetchSummary]);
 
 	const resetForm = () => {
 		setForm(emptyDebtForm);
@@ -232,10 +234,12 @@ function DebtPage() {
 				const response = await debtAPI.update(editingDebtId, payload);
 				const updatedDebt = mapApiDebtToUi(response.data);
 				setDebts((prev) => prev.map((item) => (item.id === editingDebtId ? updatedDebt : item)));
+				fetchSummary();
 				setSnackbar({ open: true, message: 'Debt updated successfully.', severity: 'success' });
 			} else {
 				const response = await debtAPI.create(payload);
 				setDebts((prev) => [mapApiDebtToUi(response.data), ...prev]);
+				fetchSummary();
 				setSnackbar({ open: true, message: 'Debt added successfully.', severity: 'success' });
 			}
 
@@ -262,6 +266,7 @@ function DebtPage() {
 		try {
 			await debtAPI.delete(id);
 			setDebts((prev) => prev.filter((item) => item.id !== id));
+			fetchSummary();
 			setSnackbar({ open: true, message: 'Debt deleted.', severity: 'info' });
 		} catch (error) {
 			console.error('Failed to delete debt:', error);
@@ -322,6 +327,7 @@ function DebtPage() {
 				)
 			);
 
+			fetchSummary();
 			closePaymentDialog();
 			setSnackbar({ open: true, message: 'Payment updated.', severity: 'success' });
 		} catch (error) {
@@ -5,6 +5,7 @@ import {
 import { styled } from '@mui/material/styles';
 import { Bar, Pie } from 'react-chartjs-2';
 import { Chart as ChartJS, CategoryScale, LinearScale, PointElement, LineElement, BarElement, ArcElement, Title, Tooltip, Legend, } from 'chart.js';
+import { format } from 'date-fns';
 import { transactionAPI, getCurrencySymbol } from '../api';
 
 // Register ChartJS components
@@ -279,14 +280,19 @@ const Reports = () => {
   const fetchData = useCallback(async () => {
     try {
       setLoading(true);
-      const [expensesRes, incomesRes, savingsRes] = await Promise.all([
-        transactionAPI.getExpenses(),
-        transactionAPI.getIncomes(),
-        transactionAPI.getSavings()
-      ]);
-      const expenses = expensesRes.data;
-      const incomes = incomesRes.data;
-      const savingsTxns = savingsRes.data;
+      // One request for every type, limited to the months the charts cover
+      const range = parseInt(timeRange);
+      const today = new Date();
+      const rangeStart = new Date(today.getFullYear(), today.getMonth() - (range - 1), 1);
+      const rangeEnd = new Date(today.getFullYear(), today.getMonth() + 1, 0);
+      const transactionsRes = await transactionAPI.filter({
+        types: 'expense,income,savings',
+        start_date: format(rangeStart, 'yyyy-MM-dd'),
+        end_date: format(rangeEnd, 'yyyy-MM-dd')
+      });
+      const expenses = transactionsRes.data.filter(t => t.transaction_type === 'expense');
+      const incomes = transactionsRes.data.filter(t => t.transaction_type === 'income');
+      const savingsTxns = transactionsRes.data.filter(t => t.transaction_type === 'savings');
 
       const filteredIncomes = filterByTimeRange(incomes, timeRange);
       const filteredExpenses = filterByTimeRange(expenses, timeRange);